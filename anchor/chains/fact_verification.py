@@ -14,11 +14,12 @@ import datetime
 import json
 import re
 
+import orjson
 from loguru import logger
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from anchor.llm_client import batch_chat_completions, chat_completion
+from anchor.llm_client import batch_chat_completions, chat_completion, extract_json_text
 from anchor.models import RawPost, _utcnow
 from anchor.verify.web_searcher import format_search_results, web_search
 
@@ -372,7 +373,6 @@ async def run_verification(raw_post_id: int, session: AsyncSession) -> dict:
         if changed:
             nodes_verified += 1
 
-    await session.flush()
     await session.commit()
 
     logger.info(
@@ -400,18 +400,11 @@ async def _call_llm(system: str, user: str) -> dict | None:
 
 
 def _parse_json(raw: str) -> dict | None:
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", raw, re.DOTALL)
-    if match:
-        json_str = match.group(1)
-    else:
-        json_str = raw.strip()
-        start = json_str.find("{")
-        end = json_str.rfind("}") + 1
-        if start == -1 or end == 0:
-            return None
-        json_str = json_str[start:end]
+    json_str = extract_json_text(raw)
+    if json_str is None:
+        return None
     try:
-        return json.loads(json_str)
+        return orjson.loads(json_str)
     except Exception as exc:
         logger.warning(f"[Verification] JSON parse error: {exc}")
         return None
@@ -15,14 +15,14 @@
 
 from __future__ import annotations
 
-import json
 import re
 
+import orjson
 from loguru import logger
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from anchor.llm_client import chat_completion
+from anchor.llm_client import chat_completion, extract_json_text
 from anchor.models import Author, RawPost, _utcnow
 from anchor.verify.author_profiler import AuthorProfiler
 
@@ -270,8 +270,6 @@ async def run_assessment(
 
         post.assessed = True
         post.assessed_at = _utcnow()
-        session.add(post)
-        await session.flush()
         logger.info(
             f"[Assessment] Post {post_id}: domain={post.content_domain!r} "
             f"nature={post.content_nature!r} type={post.content_type!r} "
@@ -380,23 +378,45 @@ def _apply_analysis(
 # ---------------------------------------------------------------------------
 
 
+# (platform, platform_id) → Author.id 进程内缓存，同一作者的批量帖子免去重复按条件查询
+_author_id_cache: dict[tuple[str, str], int] = {}
+
+
 async def _get_or_create_author(post: RawPost, session: AsyncSession) -> Author:
     """根据帖子信息查找或创建 Author 记录。"""
+    platform_id = post.author_platform_id or post.author_name
+    cache_key = (post.source, platform_id)
+    cached_id = _author_id_cache.get(cache_key)
+    if cached_id is not None:
+        author = await session.get(Author, cached_id)
+        # 核对 (platform, platform_id)：缓存的行可能随事务回滚消失，其 id 被别的作者复用
+        if author is not None and (author.platform, author.platform_id) == cache_key:
+            return author
+        _author_id_cache.pop(cache_key, None)
+
     result = await session.exec(
         select(Author)
         .where(Author.platform == post.source)
-        .where(Author.platform_id == (post.author_platform_id or post.author_name))
+        .where(Author.platform_id == platform_id)
     )
     author = result.first()
-    if author is None:
-        author = Author(
-            name=post.author_name,
-            platform=post.source,
-            platform_id=post.author_platform_id or post.author_name,
-        )
-        session.add(author)
-        await session.flush()
-        await session.refresh(author)
+    if author is not None:
+        _author_id_cache[cache_key] = author.id
+        return author
+
+    # 与采集入口共用 upsert：并发评估同一作者时不会撞 (platform, platform_id) 唯一索引
+    from anchor.collect.input_handler import upsert_author
+
+    author, is_new = await upsert_author(
+        session,
+        platform=post.source,
+        platform_id=platform_id,
+        name=post.author_name,
+        update_name=False,
+    )
+    # 新建行尚未提交，不写缓存（下次查询命中已提交的行后再缓存）
+    if not is_new:
+        _author_id_cache[cache_key] = author.id
     return author
 
 
@@ -442,16 +462,11 @@ async def _reassign_author(
 
 
 def _parse_json(raw: str) -> dict | None:
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", raw, re.DOTALL)
-    json_str = match.group(1) if match else raw.strip()
-    if not match:
-        start = json_str.find("{")
-        end = json_str.rfind("}") + 1
-        if start == -1 or end == 0:
-            return None
-        json_str = json_str[start:end]
+    json_str = extract_json_text(raw)
+    if json_str is None:
+        return None
     try:
-        return json.loads(json_str)
+        return orjson.loads(json_str)
     except Exception as exc:
         logger.warning(f"[Assessment] JSON parse error: {exc}")
         return None
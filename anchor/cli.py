@@ -69,8 +69,14 @@ def monitor(dry_run: bool, source: str | None, limit: int, concurrency: int, sin
 @main.command()
 @click.option("--host", default="0.0.0.0", help="绑定地址")
 @click.option("--port", default=8765, type=int, help="监听端口")
-def serve(host: str, port: int):
+@click.option(
+    "--workers", default=1, type=int, metavar="N", envvar="ANCHOR_WORKERS",
+    help="worker 进程数（0=CPU 核数；进程内缓存不共享，默认单进程）",
+)
+def serve(host: str, port: int, workers: int):
     """启动 Web UI 服务"""
+    import os
+
     from anchor.commands.serve import serve_command
 
-    serve_command(host=host, port=port)
+    serve_command(host=host, port=port, workers=workers or os.cpu_count() or 1)
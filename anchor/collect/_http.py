@@ -0,0 +1,196 @@
+"""
+共享 HTTP 客户端
+================
+微博移动端接口（评论翻页、上下文补全）每次新建 httpx.AsyncClient 都要重新 DNS + TCP + TLS 握手。
+这里按事件循环缓存一个长连接客户端：同一循环内所有请求复用连接池；装有 h2 时启用 HTTP/2，
+翻页请求在同一连接上多路复用。
+
+AsyncClient 绑定创建它的事件循环，CLI 各命令各自 asyncio.run()，故按循环而非全局单例缓存。
+循环被回收只会让缓存条目失效，连接并不会随之关闭：入口须在循环退出前 await aclose_shared_clients()
+（或用 closing_shared_clients 包裹主协程）显式关闭。rss_client 同理，供 RSS 源抓取复用连接（同一 CDN 的多个源免去重复握手）；
+syndication_client / jina_client 供 Twitter Syndication API 与 Jina Reader 长文抓取使用（两者必须分开）；
+youtube_client 供 YouTube 页面元数据回落请求使用；media_client 供媒体描述器探测图片体积。
+
+twitter_client：进程内共享的 tweepy.AsyncClient；tweepy 只在首次需要时导入，只用微博的部署不加载它。
+
+http_retry：限流（429）/ 5xx / 网络错误时重试，最多 3 次。服务端给出 Retry-After 时按其等待，
+否则带抖动的指数退避（避免多个并发请求同一时刻集中重试）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib.util
+import weakref
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+# 依赖声明为 httpx[http2]；仍按 h2 是否可导入判断，精简安装（缺 h2）时退回 HTTP/1.1 而非报错
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_WEIBO_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
+        "AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148"
+    ),
+    "Referer": "https://m.weibo.cn/",
+    "Accept": "application/json, text/plain, */*",
+}
+
+_LoopClients = weakref.WeakKeyDictionary  # asyncio.AbstractEventLoop → httpx.AsyncClient
+
+_weibo_clients: _LoopClients = weakref.WeakKeyDictionary()
+_rss_clients: _LoopClients = weakref.WeakKeyDictionary()
+_syndication_clients: _LoopClients = weakref.WeakKeyDictionary()
+_jina_clients: _LoopClients = weakref.WeakKeyDictionary()
+_youtube_clients: _LoopClients = weakref.WeakKeyDictionary()
+_media_clients: _LoopClients = weakref.WeakKeyDictionary()
+
+
+def _loop_client(cache: _LoopClients, **kwargs) -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = cache.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            **kwargs,
+        )
+        cache[loop] = client
+    return client
+
+
+_LOOP_CACHES: tuple[_LoopClients, ...] = (
+    _weibo_clients, _rss_clients, _syndication_clients,
+    _jina_clients, _youtube_clients, _media_clients,
+)
+
+
+async def aclose_shared_clients() -> None:
+    """关闭当前事件循环上的所有共享客户端（各缓存一并移除），单个关闭失败不影响其余。"""
+    loop = asyncio.get_running_loop()
+    clients = [c for c in (cache.pop(loop, None) for cache in _LOOP_CACHES) if c is not None]
+    await asyncio.gather(*(c.aclose() for c in clients), return_exceptions=True)
+
+
+async def closing_shared_clients(coro):
+    """运行 coro，结束（含异常退出）后关闭共享客户端。CLI 入口用法：asyncio.run(closing_shared_clients(_main()))。"""
+    try:
+        return await coro
+    finally:
+        await aclose_shared_clients()
+
+
+def weibo_client() -> httpx.AsyncClient:
+    """返回当前事件循环共享的微博移动端客户端。请求级 headers / timeout 可覆盖默认值。"""
+    return _loop_client(_weibo_clients, timeout=15, headers=_WEIBO_HEADERS)
+
+
+def rss_client() -> httpx.AsyncClient:
+    """返回当前事件循环共享的 RSS 抓取客户端（跟随重定向）。"""
+    return _loop_client(
+        _rss_clients,
+        timeout=20,
+        headers={"User-Agent": "Anchor/1.0"},
+        follow_redirects=True,
+    )
+
+
+def syndication_client() -> httpx.AsyncClient:
+    """返回当前事件循环共享的 Twitter Syndication CDN 客户端。"""
+    return _loop_client(_syndication_clients, timeout=15, follow_redirects=True)
+
+
+def jina_client() -> httpx.AsyncClient:
+    """返回当前事件循环共享的 Jina Reader 客户端（不设默认 UA，由请求级 headers 决定）。"""
+    return _loop_client(_jina_clients, timeout=45)
+
+
+_YOUTUBE_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+}
+
+
+def youtube_client() -> httpx.AsyncClient:
+    """返回当前事件循环共享的 YouTube 页面客户端（跟随重定向）。"""
+    return _loop_client(
+        _youtube_clients, timeout=20, headers=_YOUTUBE_HEADERS, follow_redirects=True,
+    )
+
+
+def media_client() -> httpx.AsyncClient:
+    """返回当前事件循环共享的媒体探测客户端（短超时，跟随重定向）。"""
+    return _loop_client(_media_clients, timeout=5, follow_redirects=True)
+
+
+@functools.lru_cache(maxsize=1)
+def twitter_client():
+    """返回共享的 tweepy.AsyncClient；未配置 TWITTER_BEARER_TOKEN 时返回 None。
+
+    tweepy.AsyncClient 每次请求自建 aiohttp 会话，不绑定事件循环，可全局复用。
+    """
+    from anchor.config import settings
+
+    if not settings.twitter_bearer_token:
+        return None
+
+    import tweepy
+    return tweepy.AsyncClient(
+        bearer_token=settings.twitter_bearer_token,
+        wait_on_rate_limit=True,
+    )
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+_MAX_WAIT = 30
+_backoff = wait_random_exponential(multiplier=1, max=_MAX_WAIT)
+
+
+def _retry_after(exc: BaseException | None) -> float | None:
+    """解析 429/503 响应的 Retry-After（秒数或 HTTP 日期），无则 None。"""
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    value = exc.response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _wait(retry_state) -> float:
+    delay = _retry_after(retry_state.outcome.exception())
+    if delay is not None:
+        return min(delay, _MAX_WAIT)
+    return _backoff(retry_state)
+
+
+http_retry = retry(
+    retry=retry_if_exception(_is_retryable),
+    wait=_wait,
+    stop=stop_after_attempt(3),
+    reraise=True,
+)
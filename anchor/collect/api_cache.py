@@ -0,0 +1,132 @@
+"""
+平台 API 响应缓存
+================
+上下文补全（context_enricher）要请求 Twitter/微博 API。重启、重跑或管线中途失败后，
+同一帖子会再次请求这些接口，既慢又消耗频率配额。本模块把响应 JSON 持久化到 api_cache 表：
+
+- key = 来源:类型:v版本:外部 ID；解析逻辑变化时递增 CACHE_VERSION，旧条目自然失效
+- 缓存的是接口原始数据（或解析后的上下文片段），不是拼接后的文本，
+  调整 _assemble 的拼接格式无需重新抓取
+- 超过 settings.context_cache_days 的条目视为过期；读写失败只记日志，不影响主流程
+- 其他调用方（如 YouTube 元数据/字幕）可传 max_age_days 使用自己的有效期，math.inf 表示永不过期
+- 批量场景用 cache_get_many / cache_put_many：一个会话内 IN 查询 / 一次提交，免去逐条开会话
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from loguru import logger
+
+from anchor.config import settings
+from anchor.models import _utcnow
+
+CACHE_VERSION = 1
+
+
+def cache_key(source: str, kind: str, external_id: str) -> str:
+    return f"{source}:{kind}:v{CACHE_VERSION}:{external_id}"
+
+
+def _ttl_days(max_age_days: float | None) -> float:
+    return settings.context_cache_days if max_age_days is None else max_age_days
+
+
+async def cache_get(key: str, max_age_days: float | None = None) -> Any | None:
+    """读取未过期的缓存 payload，未命中返回 None。
+
+    max_age_days 缺省取 settings.context_cache_days；≤ 0 表示不使用缓存。
+    """
+    ttl = _ttl_days(max_age_days)
+    if ttl <= 0:
+        return None
+
+    from anchor.database.session import AsyncSessionLocal
+    from anchor.models import APICacheEntry
+
+    try:
+        async with AsyncSessionLocal() as s:
+            entry = await s.get(APICacheEntry, key)
+    except Exception as exc:
+        logger.warning(f"[APICache] read failed: {exc}")
+        return None
+    if entry is None:
+        return None
+    if (_utcnow() - entry.created_at).total_seconds() > ttl * 86400:
+        return None
+    logger.debug(f"[APICache] hit {key}")
+    return orjson.loads(entry.payload)
+
+
+async def cache_put(key: str, payload: Any, max_age_days: float | None = None) -> None:
+    """写入（或覆盖）缓存 payload。max_age_days 与读取时一致，≤ 0 时不写入。"""
+    if _ttl_days(max_age_days) <= 0:
+        return
+
+    from anchor.database.session import AsyncSessionLocal
+    from anchor.models import APICacheEntry
+
+    try:
+        async with AsyncSessionLocal() as s:
+            await s.merge(APICacheEntry(key=key, payload=orjson.dumps(payload).decode()))
+            await s.commit()
+    except Exception as exc:
+        logger.warning(f"[APICache] write failed: {exc}")
+
+
+# 单条 IN 查询的 key 数上限（低于旧版 SQLite 的 999 个绑定参数限制）
+_IN_CHUNK = 500
+
+
+async def cache_get_many(keys: list[str], max_age_days: float | None = None) -> dict[str, Any]:
+    """批量读取未过期的缓存 payload，返回 key → payload（未命中的 key 不在结果中）。
+
+    一个 session 内按 IN 查询分块读取，取代逐条 cache_get 各开一次会话。
+    """
+    ttl = _ttl_days(max_age_days)
+    if ttl <= 0 or not keys:
+        return {}
+
+    from sqlmodel import select
+
+    from anchor.database.session import AsyncSessionLocal
+    from anchor.models import APICacheEntry
+
+    entries = []
+    try:
+        async with AsyncSessionLocal() as s:
+            for i in range(0, len(keys), _IN_CHUNK):
+                result = await s.exec(
+                    select(APICacheEntry).where(APICacheEntry.key.in_(keys[i:i + _IN_CHUNK]))
+                )
+                entries.extend(result.all())
+    except Exception as exc:
+        logger.warning(f"[APICache] batch read failed: {exc}")
+        return {}
+
+    now = _utcnow()
+    hits = {
+        e.key: orjson.loads(e.payload)
+        for e in entries
+        if (now - e.created_at).total_seconds() <= ttl * 86400
+    }
+    logger.debug(f"[APICache] batch hit {len(hits)}/{len(keys)}")
+    return hits
+
+
+async def cache_put_many(items: dict[str, Any], max_age_days: float | None = None) -> None:
+    """批量写入（或覆盖）缓存 payload，一个会话、一次提交。"""
+    if _ttl_days(max_age_days) <= 0 or not items:
+        return
+
+    from anchor.database.session import AsyncSessionLocal
+    from anchor.models import APICacheEntry
+
+    try:
+        async with AsyncSessionLocal() as s:
+            for key, payload in items.items():
+                await s.merge(APICacheEntry(key=key, payload=orjson.dumps(payload).decode()))
+            await s.commit()
+    except Exception as exc:
+        logger.warning(f"[APICache] batch write failed: {exc}")
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import sys
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 
+# 批量采集时 RawPostData 成千上万地创建：3.10+ 用 __slots__ 省去实例 __dict__；
+# 3.9 的 dataclass 不支持 slots=True，且含 default_factory 字段无法手写 __slots__，退回普通类
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class RawPostData:
     """采集器返回的原始帖子数据（未入库）"""
 
@@ -41,5 +46,11 @@ class BaseCollector(ABC):
         """
         ...
 
+    def mark_saved(self) -> None:
+        """本轮 collect() 的结果写库成功后由调用方调用。
+
+        需要在入库后才推进的采集状态（如 RSS 的 ETag / Last-Modified）在此提交；默认无操作。
+        """
+
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} source={self.source_name}>"
\ No newline at end of file
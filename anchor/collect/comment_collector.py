@@ -8,13 +8,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 
 import httpx
+import orjson
 from loguru import logger
 
+from anchor.collect._http import http_retry, twitter_client, weibo_client
+
 
 @dataclass
 class RawComment:
@@ -46,61 +51,85 @@ async def fetch_weibo_comments(
     comments: list[RawComment] = []
     max_id = 0
     max_id_type = 0
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) "
-            "AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148"
-        ),
-        "Referer": f"https://m.weibo.cn/detail/{mid}",
-        "Accept": "application/json, text/plain, */*",
-        "X-Requested-With": "XMLHttpRequest",
-    }
-
-    async with httpx.AsyncClient(timeout=15, headers=headers) as client:
-        while len(comments) < max_count:
-            params: dict = {
-                "id": mid,
-                "mid": mid,
-                "max_id_type": max_id_type,
-            }
-            if max_id:
-                params["max_id"] = max_id
-
-            try:
-                resp = await client.get(
-                    "https://m.weibo.cn/comments/hotflow",
-                    params=params,
-                )
-                resp.raise_for_status()
-                data = resp.json()
-            except Exception as exc:
-                logger.warning(f"[CommentCollector] Weibo comment fetch failed for mid={mid}: {exc}")
-                break
+    client = weibo_client()
 
-            if data.get("ok") != 1:
+    # 翻页依赖上一页的 max_id，无法并行；但拿到 max_id 后立即发出下一页请求，
+    # 与本页解析重叠执行
+    pending = asyncio.create_task(_fetch_weibo_page(client, mid, max_id, max_id_type))
+    try:
+        while pending is not None:
+            page_data = await pending
+            pending = None
+            if page_data is None:
                 break
-
-            page_data = data.get("data", {})
             page_comments = page_data.get("data", [])
             if not page_comments:
                 break
 
+            # 翻页
+            next_max_id = page_data.get("max_id", 0)
+            if (
+                next_max_id and next_max_id != max_id
+                and len(comments) + len(page_comments) < max_count
+            ):
+                max_id = next_max_id
+                max_id_type = page_data.get("max_id_type", 0)
+                pending = asyncio.create_task(
+                    _fetch_weibo_page(client, mid, max_id, max_id_type)
+                )
+                await asyncio.sleep(0)  # 让出一次事件循环，请求先发出再解析本页
+
             for c in page_comments:
                 parsed = _parse_weibo_comment(c)
                 if parsed:
                     comments.append(parsed)
+                    if len(comments) >= max_count:
+                        break
+    finally:
+        if pending is not None:
+            pending.cancel()
 
-            # 翻页
-            next_max_id = page_data.get("max_id", 0)
-            if not next_max_id or next_max_id == max_id:
-                break
-            max_id = next_max_id
-            max_id_type = page_data.get("max_id_type", 0)
-
-    logger.info(f"[CommentCollector] Weibo mid={mid}: fetched {len(comments)} comments")
+    logger.info("[CommentCollector] Weibo mid={}: fetched {} comments", mid, len(comments))
     return comments[:max_count]
 
 
+async def _fetch_weibo_page(
+    client: httpx.AsyncClient, mid: str, max_id: int, max_id_type: int,
+) -> dict | None:
+    """抓取一页 hotflow 评论，返回 data 字段；失败返回 None。"""
+    params: dict = {
+        "id": mid,
+        "mid": mid,
+        "max_id_type": max_id_type,
+    }
+    if max_id:
+        params["max_id"] = max_id
+
+    try:
+        data = await _get_hotflow(client, mid, params)
+    except Exception as exc:
+        logger.warning("[CommentCollector] Weibo comment fetch failed for mid={}: {}", mid, exc)
+        return None
+
+    if data.get("ok") != 1:
+        return None
+    return data.get("data", {})
+
+
+@http_retry
+async def _get_hotflow(client: httpx.AsyncClient, mid: str, params: dict) -> dict:
+    resp = await client.get(
+        "https://m.weibo.cn/comments/hotflow",
+        params=params,
+        headers={
+            "Referer": f"https://m.weibo.cn/detail/{mid}",
+            "X-Requested-With": "XMLHttpRequest",
+        },
+    )
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
 def _parse_weibo_comment(raw: dict) -> RawComment | None:
     user = raw.get("user") or {}
     text = _strip_html(raw.get("text", ""))
@@ -132,18 +161,11 @@ async def fetch_twitter_replies(
     需要在 .env 中配置 TWITTER_BEARER_TOKEN。
     """
     try:
-        import tweepy
-        from anchor.config import settings
-
-        if not settings.twitter_bearer_token:
+        client = twitter_client()
+        if client is None:
             logger.warning("[CommentCollector] TWITTER_BEARER_TOKEN not set, skipping replies")
             return []
 
-        client = tweepy.AsyncClient(
-            bearer_token=settings.twitter_bearer_token,
-            wait_on_rate_limit=True,
-        )
-
         # 先获取原推以得到 conversation_id
         orig = await client.get_tweet(
             tweet_id, tweet_fields=["conversation_id", "author_id"]
@@ -182,11 +204,11 @@ async def fetch_twitter_replies(
                 posted_at=posted_at,
             ))
 
-        logger.info(f"[CommentCollector] Twitter tweet_id={tweet_id}: fetched {len(comments)} replies")
+        logger.info("[CommentCollector] Twitter tweet_id={}: fetched {} replies", tweet_id, len(comments))
         return comments
 
     except Exception as exc:
-        logger.warning(f"[CommentCollector] Twitter reply fetch failed: {exc}")
+        logger.warning("[CommentCollector] Twitter reply fetch failed: {}", exc)
         return []
 
 
@@ -205,7 +227,7 @@ async def fetch_comments(
         return await fetch_weibo_comments(external_id, max_count)
     if platform == "twitter":
         return await fetch_twitter_replies(external_id, max_count)
-    logger.warning(f"[CommentCollector] Unsupported platform: {platform}")
+    logger.warning("[CommentCollector] Unsupported platform: {}", platform)
     return []
 
 
@@ -214,16 +236,25 @@ async def fetch_comments(
 # ---------------------------------------------------------------------------
 
 
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _strip_html(text: str) -> str:
-    return re.sub(r"<[^>]+>", "", text).strip()
+    return _TAG_RE.sub("", text).strip()
+
+
+# 微博 created_at 固定格式，如 "Sun Nov 10 14:23:01 +0800 2024"
+_WEIBO_TIME_FMT = "%a %b %d %H:%M:%S %z %Y"
 
 
 def _parse_weibo_time(raw: str) -> datetime:
     if not raw:
         return datetime.utcnow()
     try:
-        from email.utils import parsedate_to_datetime
-        dt = parsedate_to_datetime(raw)
-        return dt.replace(tzinfo=None)
+        return datetime.strptime(raw, _WEIBO_TIME_FMT).replace(tzinfo=None)
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(raw).replace(tzinfo=None)
     except Exception:
         return datetime.utcnow()
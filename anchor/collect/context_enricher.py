@@ -11,15 +11,25 @@ Layer 1 — Step 2: 上下文补全器
 enriched_content 字符串，供 Step 3 的 Claude 提取器使用。
 
 主入口：enrich(raw_post, session) -> str
+批量：enrich_many(raw_posts, session) -> list[str | None]
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import heapq
+import re
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 
+import orjson
 from loguru import logger
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from anchor.collect._http import http_retry, twitter_client, weibo_client
+from anchor.collect.api_cache import (
+    cache_get, cache_get_many, cache_key, cache_put, cache_put_many,
+)
 from anchor.models import RawPost, _utcnow
 
 
@@ -27,6 +37,9 @@ from anchor.models import RawPost, _utcnow
 class ContextPiece:
     """单段上下文片段"""
 
+    # 字段均无默认值，可在 3.9 上手写 __slots__（dataclass(slots=True) 需 3.10+）
+    __slots__ = ("role", "author", "content", "url")
+
     role: str           # "quoted" | "parent_reply" | "thread_prev" | "thread_next"
     author: str
     content: str
@@ -49,6 +62,10 @@ async def enrich(raw_post: RawPost, session: AsyncSession) -> str:
     elif raw_post.source == "weibo":
         pieces = await _enrich_weibo(raw_post)
 
+    return _apply_context(raw_post, session, pieces)
+
+
+def _apply_context(raw_post: RawPost, session: AsyncSession, pieces: list[ContextPiece]) -> str:
     raw_post.context_fetched = True
     raw_post.has_context = bool(pieces)
 
@@ -62,6 +79,44 @@ async def enrich(raw_post: RawPost, session: AsyncSession) -> str:
     return raw_post.enriched_content
 
 
+async def enrich_many(
+    raw_posts: list[RawPost],
+    session: AsyncSession,
+    max_concurrency: int = 8,
+) -> list[str | None]:
+    """并发为多条帖子补全上下文，返回与 raw_posts 等长的文本列表。
+
+    上下文抓取均为网络 I/O，各帖互不依赖；session 仅做同步的 add，可安全共享。
+    Twitter 帖子先经 get_tweets 批量拉取（每次最多 100 条），批量失败时退回逐条抓取。
+    单条失败记日志并返回 None，不影响其余帖子。调用方负责 commit。
+    """
+    twitter_posts = [rp for rp in raw_posts if rp.source == "twitter" and not rp.context_fetched]
+    prefetched: dict[str, list[ContextPiece]] = {}
+    if twitter_posts:
+        try:
+            prefetched = await _enrich_twitter_batch(twitter_posts, max_concurrency)
+        except Exception as exc:
+            logger.warning(f"[ContextEnricher] Twitter batch enrichment failed, falling back: {exc}")
+
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _one(raw_post: RawPost) -> str:
+        if raw_post.source == "twitter" and raw_post.external_id in prefetched:
+            return _apply_context(raw_post, session, prefetched[raw_post.external_id])
+        async with sem:
+            return await enrich(raw_post, session)
+
+    results = await asyncio.gather(*(_one(rp) for rp in raw_posts), return_exceptions=True)
+    out: list[str | None] = []
+    for rp, r in zip(raw_posts, results):
+        if isinstance(r, BaseException):
+            logger.warning(f"[ContextEnricher] enrich failed for {rp.external_id}: {r}")
+            out.append(None)
+        else:
+            out.append(r)
+    return out
+
+
 # ---------------------------------------------------------------------------
 # 拼接格式
 # ---------------------------------------------------------------------------
@@ -73,32 +128,37 @@ _ROLE_LABEL = {
     "thread_next": "【下一条】",
 }
 
+# 放在主文本之前的上下文（引用源、线程前文）与之后的续文，模板预先拼好
+_BEFORE_FMT = {
+    role: _ROLE_LABEL[role] + "\n作者：{}\n内容：{}"
+    for role in ("quoted", "parent_reply", "thread_prev")
+}
+_AFTER_FMT = _ROLE_LABEL["thread_next"] + "\n{}"
+
 
 def _assemble(main_content: str, pieces: list[ContextPiece]) -> str:
     """将上下文片段与主文本拼接为 Claude 易于理解的结构化文本。"""
-    parts: list[str] = []
-
-    # 先放上下文（引用源、线程前文）
+    before: list[str] = []
+    after: list[str] = []
     for p in pieces:
-        if p.role in ("quoted", "parent_reply", "thread_prev"):
-            label = _ROLE_LABEL.get(p.role, f"[{p.role}]")
-            parts.append(f"{label}\n作者：{p.author}\n内容：{p.content}")
+        fmt = _BEFORE_FMT.get(p.role)
+        if fmt is not None:
+            before.append(fmt.format(p.author, p.content))
+        elif p.role == "thread_next":
+            after.append(_AFTER_FMT.format(p.content))
 
-    # 主文本
-    parts.append(f"【主要内容】\n{main_content}")
-
-    # 线程续文
-    for p in pieces:
-        if p.role == "thread_next":
-            parts.append(f"{_ROLE_LABEL['thread_next']}\n{p.content}")
-
-    return "\n\n".join(parts)
+    return "\n\n".join([*before, f"【主要内容】\n{main_content}", *after])
 
 
 # ---------------------------------------------------------------------------
 # Twitter 上下文抓取
 # ---------------------------------------------------------------------------
 
+_TWEET_FIELDS = ["referenced_tweets", "conversation_id", "author_id", "text"]
+_TWEET_EXPANSIONS = ["referenced_tweets.id", "referenced_tweets.id.author_id"]
+_GET_TWEETS_MAX = 100   # get_tweets 单次最多 100 个 ID
+
+
 async def _enrich_twitter(raw_post: RawPost) -> list[ContextPiece]:
     """
     Twitter 上下文来源：
@@ -107,55 +167,38 @@ async def _enrich_twitter(raw_post: RawPost) -> list[ContextPiece]:
       3. conversation_id 相同的前序推文     → 线程
     """
     try:
-        from anchor.config import settings
-        if not settings.twitter_bearer_token:
+        client = twitter_client()
+        if client is None:
             return []
 
-        import tweepy
-        client = tweepy.AsyncClient(
-            bearer_token=settings.twitter_bearer_token,
-            wait_on_rate_limit=True,
-        )
+        key = cache_key("twitter", "context", raw_post.external_id)
+        cached = await cache_get(key)
+        if cached is not None:
+            return [ContextPiece(**p) for p in cached]
 
         resp = await client.get_tweet(
             raw_post.external_id,
-            tweet_fields=["referenced_tweets", "conversation_id", "author_id", "text"],
-            expansions=["referenced_tweets.id", "referenced_tweets.id.author_id"],
+            tweet_fields=_TWEET_FIELDS,
+            expansions=_TWEET_EXPANSIONS,
             user_fields=["username"],
         )
         if not resp.data:
             return []
 
         tweet = resp.data
-        pieces: list[ContextPiece] = []
 
-        # 建立 tweet_id -> (text, username) 映射
-        ref_map: dict[str, tuple[str, str]] = {}
-        user_map: dict[str, str] = {}
-        if resp.includes:
-            for u in resp.includes.get("users", []):
-                user_map[str(u.id)] = u.username
-            for t in resp.includes.get("tweets", []):
-                username = user_map.get(str(t.author_id), "unknown")
-                ref_map[str(t.id)] = (t.text, username)
-
-        for ref in (tweet.referenced_tweets or []):
-            ref_id = str(ref.id)
-            text, author = ref_map.get(ref_id, ("（无法获取内容）", "unknown"))
-            role = "quoted" if ref.type == "quoted" else "parent_reply"
-            pieces.append(ContextPiece(
-                role=role,
-                author=author,
-                content=text,
-                url=f"https://twitter.com/i/web/status/{ref_id}",
-            ))
+        # 若是线程中的帖子，同一 conversation 的前序帖子搜索与引用解析互不依赖，先发出请求
+        conv_id = _thread_conversation(tweet)
+        thread_task = None
+        if conv_id:
+            thread_task = asyncio.create_task(_search_thread(client, conv_id))
+            await asyncio.sleep(0)
 
-        # 若是线程中的帖子，尝试获取同一 conversation 的前序帖子
-        conv_id = str(tweet.conversation_id) if tweet.conversation_id else None
-        if conv_id and conv_id != raw_post.external_id:
-            thread_pieces = await _fetch_thread_context(client, conv_id, raw_post.external_id)
-            pieces.extend(thread_pieces)
+        pieces = _ref_pieces(tweet, _ref_map(resp.includes))
+        if thread_task is not None:
+            pieces.extend(_thread_pieces(await thread_task, raw_post.external_id))
 
+        await cache_put(key, [asdict(p) for p in pieces])
         return pieces
 
     except Exception as exc:
@@ -163,8 +206,103 @@ async def _enrich_twitter(raw_post: RawPost) -> list[ContextPiece]:
         return []
 
 
-async def _fetch_thread_context(client, conversation_id: str, current_id: str) -> list[ContextPiece]:
-    """获取同一线程中当前帖子之前的内容（按时间排序取最近 3 条）"""
+async def _enrich_twitter_batch(
+    raw_posts: list[RawPost],
+    max_concurrency: int = 8,
+) -> dict[str, list[ContextPiece]]:
+    """批量抓取 Twitter 上下文：get_tweets 每 100 条一次往返，线程搜索按 conversation_id 去重。
+
+    返回 external_id → 上下文片段；API 未返回的推文（已删除等）对应空列表。
+    """
+    client = twitter_client()
+    if client is None:
+        return {rp.external_id: [] for rp in raw_posts}
+
+    # 缓存一次 IN 查询批量读取，未命中的再走 API
+    keys = {rp.external_id: cache_key("twitter", "context", rp.external_id) for rp in raw_posts}
+    cached = await cache_get_many(list(keys.values()))
+    out: dict[str, list[ContextPiece]] = {}
+    pending: list[str] = []
+    for tweet_id, key in keys.items():
+        if key in cached:
+            out[tweet_id] = [ContextPiece(**p) for p in cached[key]]
+        else:
+            pending.append(tweet_id)
+
+    tweets = []
+    ref_map: dict[str, tuple[str, str]] = {}
+    for i in range(0, len(pending), _GET_TWEETS_MAX):
+        resp = await client.get_tweets(
+            pending[i:i + _GET_TWEETS_MAX],
+            tweet_fields=_TWEET_FIELDS,
+            expansions=_TWEET_EXPANSIONS,
+            user_fields=["username"],
+        )
+        tweets.extend(resp.data or [])
+        ref_map.update(_ref_map(resp.includes))
+
+    # 同一线程的多条帖子只搜索一次
+    conv_ids = list({c for c in map(_thread_conversation, tweets) if c})
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def _search(conv_id: str):
+        async with sem:
+            return await _search_thread(client, conv_id)
+
+    threads = dict(zip(conv_ids, await asyncio.gather(*(_search(c) for c in conv_ids))))
+
+    fresh: dict[str, list[dict]] = {}
+    for tweet in tweets:
+        tweet_id = str(tweet.id)
+        pieces = _ref_pieces(tweet, ref_map)
+        conv_id = _thread_conversation(tweet)
+        if conv_id:
+            pieces.extend(_thread_pieces(threads[conv_id], tweet_id))
+        out[tweet_id] = pieces
+        fresh[cache_key("twitter", "context", tweet_id)] = [asdict(p) for p in pieces]
+    await cache_put_many(fresh)
+
+    for tweet_id in pending:
+        out.setdefault(tweet_id, [])
+    return out
+
+
+def _thread_conversation(tweet) -> str | None:
+    """推文属于他人发起的线程时返回 conversation_id，否则 None。"""
+    conv_id = str(tweet.conversation_id) if tweet.conversation_id else None
+    if conv_id and conv_id != str(tweet.id):
+        return conv_id
+    return None
+
+
+def _ref_map(includes) -> dict[str, tuple[str, str]]:
+    """建立 tweet_id -> (text, username) 映射"""
+    ref_map: dict[str, tuple[str, str]] = {}
+    if not includes:
+        return ref_map
+    user_map = {str(u.id): u.username for u in includes.get("users", [])}
+    for t in includes.get("tweets", []):
+        ref_map[str(t.id)] = (t.text, user_map.get(str(t.author_id), "unknown"))
+    return ref_map
+
+
+def _ref_pieces(tweet, ref_map: dict[str, tuple[str, str]]) -> list[ContextPiece]:
+    pieces: list[ContextPiece] = []
+    for ref in (tweet.referenced_tweets or []):
+        ref_id = str(ref.id)
+        text, author = ref_map.get(ref_id, ("（无法获取内容）", "unknown"))
+        role = "quoted" if ref.type == "quoted" else "parent_reply"
+        pieces.append(ContextPiece(
+            role=role,
+            author=author,
+            content=text,
+            url=f"https://twitter.com/i/web/status/{ref_id}",
+        ))
+    return pieces
+
+
+async def _search_thread(client, conversation_id: str):
+    """搜索同一 conversation 的推文，返回 (tweets, user_map)；失败或无结果返回 None。"""
     try:
         resp = await client.search_recent_tweets(
             query=f"conversation_id:{conversation_id}",
@@ -173,25 +311,40 @@ async def _fetch_thread_context(client, conversation_id: str, current_id: str) -
             expansions=["author_id"],
             user_fields=["username"],
         )
-        if not resp.data:
-            return []
+    except Exception:
+        return None
+    if not resp.data:
+        return None
+    user_map = {str(u.id): u.username for u in (resp.includes or {}).get("users", [])}
+    return resp.data, user_map
 
-        user_map = {str(u.id): u.username for u in (resp.includes or {}).get("users", [])}
 
-        pieces: list[ContextPiece] = []
-        for t in sorted(resp.data, key=lambda x: x.created_at or ""):
-            if str(t.id) == current_id:
-                continue
-            pieces.append(ContextPiece(
-                role="thread_prev",
-                author=user_map.get(str(t.author_id), "unknown"),
-                content=t.text,
-                url=f"https://twitter.com/i/web/status/{t.id}",
-            ))
-        # 只保留最近 3 条前序帖
-        return pieces[-3:]
-    except Exception:
+def _thread_pieces(thread, current_id: str) -> list[ContextPiece]:
+    """线程中当前帖子之外的内容（按时间排序取最近 3 条）"""
+    if thread is None:
         return []
+    tweets, user_map = thread
+
+    # 只保留最近 3 条前序帖（按时间升序输出）
+    others = (t for t in tweets if str(t.id) != current_id)
+    recent = heapq.nlargest(3, others, key=_created_key)
+    return [
+        ContextPiece(
+            role="thread_prev",
+            author=user_map.get(str(t.author_id), "unknown"),
+            content=t.text,
+            url=f"https://twitter.com/i/web/status/{t.id}",
+        )
+        for t in reversed(recent)
+    ]
+
+
+_MIN_TIME = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _created_key(tweet) -> datetime:
+    # tweepy 返回带时区的 datetime；缺失时排最早（不能用 "" 与 datetime 比较）
+    return tweet.created_at or _MIN_TIME
 
 
 # ---------------------------------------------------------------------------
@@ -205,19 +358,14 @@ async def _enrich_weibo(raw_post: RawPost) -> list[ContextPiece]:
       2. 长文折叠内容（longText API）
     """
     try:
-        import httpx
-
         pieces: list[ContextPiece] = []
 
-        # 尝试通过移动端接口获取帖子详情
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.get(
-                "https://m.weibo.cn/statuses/show",
-                params={"id": raw_post.external_id},
-                headers={"User-Agent": "Mozilla/5.0", "Referer": "https://m.weibo.cn/"},
-            )
-            resp.raise_for_status()
-            data = resp.json().get("data", {})
+        # 尝试通过移动端接口获取帖子详情（原始响应按外部 ID 缓存）
+        key = cache_key("weibo", "status", raw_post.external_id)
+        data = await cache_get(key)
+        if data is None:
+            data = await _get_weibo_status(raw_post.external_id)
+            await cache_put(key, data)
 
         # 转发的原微博
         retweeted = data.get("retweeted_status")
@@ -245,6 +393,20 @@ async def _enrich_weibo(raw_post: RawPost) -> list[ContextPiece]:
         return []
 
 
+@http_retry
+async def _get_weibo_status(external_id: str) -> dict:
+    resp = await weibo_client().get(
+        "https://m.weibo.cn/statuses/show",
+        params={"id": external_id},
+        headers={"User-Agent": "Mozilla/5.0"},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    return orjson.loads(resp.content).get("data", {})
+
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
 def _strip_html(text: str) -> str:
-    import re
-    return re.sub(r"<[^>]+>", "", text).strip()
+    return _TAG_RE.sub("", text).strip()
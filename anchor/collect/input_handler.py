@@ -12,11 +12,13 @@ Layer 1 — Step 1: 输入处理器
 
 from __future__ import annotations
 
+import functools
 import re
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from urllib.parse import urlparse
 
+import orjson
 from loguru import logger
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -38,91 +40,129 @@ class ParsedURL:
     canonical_url: str
 
 
+# 各平台 ID / 用户名均为 ASCII：re.ASCII 让 \w 只匹配 [A-Za-z0-9_]
 _TWITTER_POST = re.compile(
-    r"(?:twitter\.com|x\.com)/\w+/status/(\d+)"
+    r"(?:twitter\.com|x\.com)/\w+/status/(\d+)",
+    re.ASCII,
 )
 _TWITTER_PROFILE = re.compile(
-    r"(?:twitter\.com|x\.com)/(@?[\w]+)/?$"
+    r"(?:twitter\.com|x\.com)/(@?[\w]+)/?$",
+    re.ASCII,
 )
 _WEIBO_POST = re.compile(
-    r"weibo\.com/\d+/(\w+)|m\.weibo\.cn/(?:status|detail)/(\w+)"
+    r"weibo\.com/\d+/(\w+)|m\.weibo\.cn/(?:status|detail)/(\w+)",
+    re.ASCII,
 )
 _WEIBO_PROFILE = re.compile(
-    r"weibo\.com/(?:u/)?(\d+)/?$|weibo\.com/([\w]+)/?$"
+    r"weibo\.com/(?:u/)?(\d+)/?$|weibo\.com/([\w]+)/?$",
+    re.ASCII,
 )
 _YOUTUBE_VIDEO = re.compile(
-    r"(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/shorts/)([A-Za-z0-9_-]{11})"
+    r"(?:youtube\.com/watch\?(?:.*&)?v=|youtu\.be/|youtube\.com/shorts/)([A-Za-z0-9_-]{11})",
+    re.ASCII,
 )
 _BILIBILI_VIDEO = re.compile(
-    r"bilibili\.com/video/(BV[\w]+)"
+    r"bilibili\.com/video/(BV[\w]+)",
+    re.ASCII,
 )
 _TRUTHSOCIAL_POST = re.compile(
-    r"truthsocial\.com/@[\w.]+/posts/(\d+)"
+    r"truthsocial\.com/@[\w.]+/posts/(\d+)",
+    re.ASCII,
 )
 _TRUTHSOCIAL_PROFILE = re.compile(
-    r"truthsocial\.com/@([\w.]+)/?$"
+    r"truthsocial\.com/@([\w.]+)/?$",
+    re.ASCII,
 )
 
 
+def _parse_twitter(url: str) -> ParsedURL | None:
+    if m := _TWITTER_POST.search(url):
+        return ParsedURL("twitter", SourceType.POST, m.group(1), url)
+    if m := _TWITTER_PROFILE.search(url):
+        username = m.group(1).lstrip("@")
+        return ParsedURL(
+            "twitter", SourceType.PROFILE, username,
+            f"https://twitter.com/{username}"
+        )
+    return None
+
+
+def _parse_weibo(url: str) -> ParsedURL | None:
+    if m := _WEIBO_POST.search(url):
+        post_id = m.group(1) or m.group(2)
+        return ParsedURL("weibo", SourceType.POST, post_id, url)
+    if m := _WEIBO_PROFILE.search(url):
+        user_id = m.group(1) or m.group(2)
+        return ParsedURL(
+            "weibo", SourceType.PROFILE, user_id,
+            f"https://weibo.com/{user_id}"
+        )
+    return None
+
+
+def _parse_youtube(url: str) -> ParsedURL | None:
+    if m := _YOUTUBE_VIDEO.search(url):
+        video_id = m.group(1)
+        return ParsedURL(
+            "youtube", SourceType.POST, video_id,
+            f"https://www.youtube.com/watch?v={video_id}"
+        )
+    return None
+
+
+def _parse_bilibili(url: str) -> ParsedURL | None:
+    if m := _BILIBILI_VIDEO.search(url):
+        bv_id = m.group(1)
+        return ParsedURL(
+            "bilibili", SourceType.POST, bv_id,
+            f"https://www.bilibili.com/video/{bv_id}"
+        )
+    return None
+
+
+def _parse_truthsocial(url: str) -> ParsedURL | None:
+    if m := _TRUTHSOCIAL_POST.search(url):
+        return ParsedURL("truthsocial", SourceType.POST, m.group(1), url)
+    if m := _TRUTHSOCIAL_PROFILE.search(url):
+        username = m.group(1)
+        return ParsedURL(
+            "truthsocial", SourceType.PROFILE, username,
+            f"https://truthsocial.com/@{username}"
+        )
+    return None
+
+
+# 注册域名 → 平台解析器；子域名（www. / mobile. / m. 等）按父域逐级回退匹配
+_HOST_PARSERS = {
+    "twitter.com": _parse_twitter,
+    "x.com": _parse_twitter,
+    "weibo.com": _parse_weibo,
+    "weibo.cn": _parse_weibo,
+    "youtube.com": _parse_youtube,
+    "youtu.be": _parse_youtube,
+    "bilibili.com": _parse_bilibili,
+    "truthsocial.com": _parse_truthsocial,
+}
+
+
+def _host_parser(host: str):
+    while host:
+        if parser := _HOST_PARSERS.get(host):
+            return parser
+        _, _, host = host.partition(".")
+    return None
+
+
 def parse_url(url: str) -> ParsedURL:
     """解析输入 URL，返回平台、类型、平台 ID。"""
     url = url.strip()
     if not url.startswith(("http://", "https://")):
         url = "https://" + url
 
-    host = urlparse(url).netloc.lower()
-
-    # --- Twitter / X ---
-    if "twitter.com" in host or "x.com" in host:
-        if m := _TWITTER_POST.search(url):
-            return ParsedURL("twitter", SourceType.POST, m.group(1), url)
-        if m := _TWITTER_PROFILE.search(url):
-            username = m.group(1).lstrip("@")
-            return ParsedURL(
-                "twitter", SourceType.PROFILE, username,
-                f"https://twitter.com/{username}"
-            )
-
-    # --- 微博 ---
-    if "weibo.com" in host or "m.weibo.cn" in host:
-        if m := _WEIBO_POST.search(url):
-            post_id = m.group(1) or m.group(2)
-            return ParsedURL("weibo", SourceType.POST, post_id, url)
-        if m := _WEIBO_PROFILE.search(url):
-            user_id = m.group(1) or m.group(2)
-            return ParsedURL(
-                "weibo", SourceType.PROFILE, user_id,
-                f"https://weibo.com/{user_id}"
-            )
-
-    # --- YouTube ---
-    if "youtube.com" in host or "youtu.be" in host:
-        if m := _YOUTUBE_VIDEO.search(url):
-            video_id = m.group(1)
-            return ParsedURL(
-                "youtube", SourceType.POST, video_id,
-                f"https://www.youtube.com/watch?v={video_id}"
-            )
-
-    # --- Bilibili ---
-    if "bilibili.com" in host:
-        if m := _BILIBILI_VIDEO.search(url):
-            bv_id = m.group(1)
-            return ParsedURL(
-                "bilibili", SourceType.POST, bv_id,
-                f"https://www.bilibili.com/video/{bv_id}"
-            )
-
-    # --- Truth Social ---
-    if "truthsocial.com" in host:
-        if m := _TRUTHSOCIAL_POST.search(url):
-            return ParsedURL("truthsocial", SourceType.POST, m.group(1), url)
-        if m := _TRUTHSOCIAL_PROFILE.search(url):
-            username = m.group(1)
-            return ParsedURL(
-                "truthsocial", SourceType.PROFILE, username,
-                f"https://truthsocial.com/@{username}"
-            )
+    host = urlparse(url).hostname or ""
+    parser = _host_parser(host)
+    if parser is not None and (parsed := parser(url)):
+        return parsed
 
     # --- 通用网页（兜底）---
     import hashlib
@@ -209,7 +249,7 @@ async def process_url(url: str, session: AsyncSession) -> InputResult:
     if parsed.source_type == SourceType.POST:
         raw_posts_data = await fetcher.fetch_post(parsed.platform_id)
     else:
-        since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=365)
+        since = _utcnow() - timedelta(days=365)
         raw_posts_data = await fetcher.fetch_profile(parsed.platform_id, since=since)
 
     # 获取或创建 Author
@@ -303,29 +343,39 @@ async def poll_monitored_source(
 # ---------------------------------------------------------------------------
 
 
-def _get_fetcher(platform: str):
-    """返回对应平台的采集器实例（懒加载）"""
+@functools.lru_cache(maxsize=None)
+def _get_collector(platform: str):
+    """返回对应平台的采集器实例（懒加载；进程内单例，复用其客户端 / 鉴权状态）"""
     if platform == "twitter":
         from anchor.collect.twitter import TwitterCollector
-        return _TwitterFetchAdapter(TwitterCollector())
+        return TwitterCollector()
     if platform == "weibo":
         from anchor.collect.weibo import WeiboCollector
-        return _WeiboFetchAdapter(WeiboCollector())
+        return WeiboCollector()
     if platform == "youtube":
         from anchor.collect.youtube import YouTubeCollector
-        return _YouTubeFetchAdapter(YouTubeCollector())
+        return YouTubeCollector()
     if platform == "truthsocial":
         from anchor.collect.truthsocial import TruthSocialCollector
-        return _TruthSocialFetchAdapter(TruthSocialCollector())
+        return TruthSocialCollector()
     if platform == "bilibili":
         from anchor.collect.bilibili import BilibiliCollector
-        return _BilibiliFetchAdapter(BilibiliCollector())
+        return BilibiliCollector()
     if platform == "web":
         from anchor.collect.web import WebCollector
-        return _WebFetchAdapter(WebCollector())
+        return WebCollector()
     raise ValueError(f"不支持的平台：{platform}")
 
 
+def _get_fetcher(platform: str):
+    """返回对应平台的采集适配器。
+
+    适配器很轻且 TruthSocial / Web 适配器带 set_url 状态，每次新建，避免并发处理 URL 时互相覆盖。
+    """
+    collector = _get_collector(platform)
+    return _FETCH_ADAPTERS[platform](collector)
+
+
 async def _get_or_create_author(
     session: AsyncSession,
     parsed: ParsedURL,
@@ -333,31 +383,116 @@ async def _get_or_create_author(
 ) -> tuple[Author, bool]:
     """从已抓取的帖子中提取作者信息，写入或复用 authors 表。
 
+    写入走 upsert_author：新作者直接插入，已有作者顺带刷新显示名。
+
     Returns:
         (author, is_new) — is_new=True 表示本次新创建了该 Author 记录
     """
     author_name = posts[0].author_name if posts else parsed.platform_id
     author_platform_id = posts[0].author_id if posts else parsed.platform_id
 
-    existing = await session.exec(
-        select(Author).where(
-            Author.platform == parsed.platform,
-            Author.platform_id == author_platform_id,
-        )
-    )
-    author = existing.first()
-    if author:
-        return author, False
-
-    author = Author(
-        name=author_name,
+    return await upsert_author(
+        session,
         platform=parsed.platform,
         platform_id=author_platform_id,
+        name=author_name,
         profile_url=f"https://{parsed.platform}.com/{author_platform_id}",
+        # 没抓到帖子时 author_name 只是 platform_id 兜底，不覆盖已有显示名
+        update_name=bool(posts),
+    )
+
+
+def _dumps(obj) -> str:
+    """orjson 序列化为 str（UTF-8 原样输出，等价于 json.dumps(..., ensure_ascii=False)）。"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _dialect_insert(session: AsyncSession, model):
+    """按当前数据库方言构造支持 ON CONFLICT 的 INSERT（SQLite / PostgreSQL）。"""
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+async def upsert_author(
+    session: AsyncSession,
+    *,
+    platform: str,
+    platform_id: str | None,
+    name: str,
+    profile_url: str | None = None,
+    update_name: bool = True,
+) -> tuple[Author, bool]:
+    """按 (platform, platform_id) 写入或复用 Author，返回 (author, is_new)。
+
+    依赖 authors 上的 (platform, platform_id) 唯一索引，并发处理同一作者也不会重复建档：
+    PostgreSQL 用 ON CONFLICT DO UPDATE ... RETURNING，附带 (xmax = 0) 判断是否新插入；
+    其他方言用 ON CONFLICT DO NOTHING ... RETURNING，无返回行即已存在，再查出已有记录。
+    update_name=False 时冲突不覆盖已有显示名。
+    platform_id 为 NULL 时唯一索引不生效，退回按 IS NULL 查找已有记录。
+    """
+    if platform_id is None:
+        result = await session.exec(
+            select(Author).where(Author.platform == platform, Author.platform_id.is_(None))
+        )
+        author = result.first()
+        if author is not None:
+            return author, False
+        author = Author(name=name, platform=platform, platform_id=None, profile_url=profile_url)
+        session.add(author)
+        await session.flush()
+        return author, True
+
+    stmt = _dialect_insert(session, Author).values(
+        name=name,
+        platform=platform,
+        platform_id=platform_id,
+        profile_url=profile_url,
+        created_at=_utcnow(),
+    )
+
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy import literal_column
+
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["platform", "platform_id"],
+            set_={"name": stmt.excluded.name if update_name else stmt.table.c.name},
+        ).returning(Author, literal_column("(xmax = 0)").label("inserted"))
+        result = await session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        author, inserted = result.one()
+        return author, bool(inserted)
+
+    stmt = stmt.on_conflict_do_nothing(
+        index_elements=["platform", "platform_id"],
+    ).returning(Author)
+    result = await session.scalars(stmt)
+    author = result.one_or_none()
+    if author is not None:
+        return author, True
+
+    result = await session.exec(
+        select(Author).where(Author.platform == platform, Author.platform_id == platform_id)
+    )
+    author = result.one()
+    if update_name and author.name != name:
+        author.name = name
+        await session.flush()
+    return author, False
+
+
+def insert_new_posts(session: AsyncSession):
+    """raw_posts 的 INSERT ... ON CONFLICT (source, external_id) DO NOTHING 语句。
+
+    依赖 raw_posts 上的 (source, external_id) 唯一索引：已入库的和本批内重复的都由数据库跳过，
+    无需先查后插，并发采集也不会写出重复行。
+    """
+    return _dialect_insert(session, RawPost).on_conflict_do_nothing(
+        index_elements=["source", "external_id"]
     )
-    session.add(author)
-    await session.flush()
-    return author, True
 
 
 async def _save_raw_posts(
@@ -365,37 +500,30 @@ async def _save_raw_posts(
     posts: list[RawPostData],
     monitored_source_id: int,
 ) -> list[RawPost]:
-    """批量写入 raw_posts，跳过已存在的（按 source + external_id 去重）。"""
-    import json
-
-    saved: list[RawPost] = []
-    for p in posts:
-        existing = await session.exec(
-            select(RawPost).where(
-                RawPost.source == p.source,
-                RawPost.external_id == p.external_id,
-            )
-        )
-        if existing.first():
-            continue
-
-        db_post = RawPost(
-            source=p.source,
-            external_id=p.external_id,
-            content=p.content,
-            author_name=p.author_name,
-            author_platform_id=p.author_id,
-            url=p.url,
-            posted_at=p.posted_at,
-            raw_metadata=json.dumps(p.metadata, ensure_ascii=False),
-            media_json=json.dumps(p.media_items, ensure_ascii=False) if p.media_items else None,
-            monitored_source_id=monitored_source_id,
-        )
-        session.add(db_post)
-        saved.append(db_post)
+    """批量写入 raw_posts，跳过已存在的（按 source + external_id 去重）。
 
-    await session.flush()
-    return saved
+    一条 INSERT ... ON CONFLICT DO NOTHING RETURNING 批量写入（executemany），
+    只返回实际新增的 ORM 实例（带主键）。
+    """
+    if not posts:
+        return []
+    rows = [
+        {
+            "source": p.source,
+            "external_id": p.external_id,
+            "content": p.content,
+            "author_name": p.author_name,
+            "author_platform_id": p.author_id,
+            "url": p.url,
+            "posted_at": p.posted_at,
+            "raw_metadata": _dumps(p.metadata),
+            "media_json": _dumps(p.media_items) if p.media_items else None,
+            "monitored_source_id": monitored_source_id,
+        }
+        for p in posts
+    ]
+    result = await session.scalars(insert_new_posts(session).returning(RawPost), rows)
+    return list(result.all())
 
 
 # ---------------------------------------------------------------------------
@@ -544,3 +672,13 @@ class _YouTubeFetchAdapter:
         self, channel_id: str, since: datetime | None
     ) -> list[RawPostData]:
         return []
+
+
+_FETCH_ADAPTERS = {
+    "twitter": _TwitterFetchAdapter,
+    "weibo": _WeiboFetchAdapter,
+    "youtube": _YouTubeFetchAdapter,
+    "truthsocial": _TruthSocialFetchAdapter,
+    "bilibili": _BilibiliFetchAdapter,
+    "web": _WebFetchAdapter,
+}
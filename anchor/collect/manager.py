@@ -8,56 +8,91 @@
 
 from __future__ import annotations
 
-import json
 import argparse
 import asyncio
+from collections.abc import Callable
 from datetime import datetime
 
 from loguru import logger
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from anchor.collect._http import closing_shared_clients
 from anchor.collect.base import BaseCollector, RawPostData
-from anchor.collect.rss import RSSCollector
+from anchor.collect.input_handler import _dumps, insert_new_posts
 from anchor.config import settings
-from anchor.models import RawPost
+from anchor.models import RawPost, _utcnow
 from anchor.database.session import AsyncSessionLocal, create_tables
 
 
+def _make_rss() -> BaseCollector:
+    from anchor.collect.rss import RSSCollector
+    return RSSCollector()
+
+
+def _make_twitter() -> BaseCollector:
+    from anchor.collect.twitter import TwitterCollector
+    return TwitterCollector()
+
+
+def _make_weibo() -> BaseCollector:
+    from anchor.collect.weibo import WeiboCollector
+    return WeiboCollector()
+
+
 class CollectorManager:
     def __init__(self) -> None:
-        self._collectors: list[BaseCollector] = []
+        # 注册时只登记工厂；采集器（及其模块导入、客户端初始化）在首次采集时才构造
+        self._factories: dict[str, Callable[[], BaseCollector]] = {}
+        self._built: dict[str, BaseCollector] = {}
         self._register_collectors()
 
     def _register_collectors(self) -> None:
         # RSS 采集器（无需 API Key，默认启用）
-        self._collectors.append(RSSCollector())
+        self._factories["rss"] = _make_rss
         logger.info("Registered collector: RSSCollector")
 
         # Twitter 采集器（需要 Bearer Token）
         if settings.twitter_bearer_token:
-            from anchor.collect.twitter import TwitterCollector
-            self._collectors.append(TwitterCollector())
+            self._factories["twitter"] = _make_twitter
             logger.info("Registered collector: TwitterCollector")
         else:
             logger.warning("TWITTER_BEARER_TOKEN not set — TwitterCollector disabled")
 
         # 微博采集器
-        from anchor.collect.weibo import WeiboCollector
-        self._collectors.append(WeiboCollector())
+        self._factories["weibo"] = _make_weibo
         mode = "API mode" if settings.weibo_access_token else "scraper mode"
         logger.info(f"Registered collector: WeiboCollector ({mode})")
 
+    @property
+    def _collectors(self) -> list[BaseCollector]:
+        """已注册的采集器实例（首次访问时构造，之后复用）"""
+        for name, factory in self._factories.items():
+            if name not in self._built:
+                self._built[name] = factory()
+        return list(self._built.values())
+
     async def run_once(self) -> int:
-        """执行一轮全量采集，返回新入库的帖子数量"""
+        """执行一轮全量采集，返回新入库的帖子数量
+
+        各采集器 I/O 互不依赖，并发抓取（耗时取决于最慢的一个）；写库仍按采集器依次进行。
+        """
         logger.info("Starting collection round...")
         total_new = 0
 
+        collectors = self._collectors
+        results = await asyncio.gather(
+            *(collector.collect() for collector in collectors),
+            return_exceptions=True,
+        )
+
         async with AsyncSessionLocal() as session:
-            for collector in self._collectors:
+            for collector, posts in zip(collectors, results):
+                if isinstance(posts, BaseException):
+                    logger.opt(exception=posts).error(f"{collector} — unexpected error: {posts}")
+                    continue
                 try:
-                    posts = await collector.collect()
                     new_count = await self._save_posts(session, posts)
+                    collector.mark_saved()
                     total_new += new_count
                     logger.info(
                         f"{collector} — fetched {len(posts)}, new {new_count}"
@@ -75,32 +110,28 @@ class CollectorManager:
         if not posts:
             return 0
 
-        new_count = 0
-        for post in posts:
-            # 按 source + external_id 去重
-            existing = await session.exec(
-                select(RawPost).where(
-                    RawPost.source == post.source,
-                    RawPost.external_id == post.external_id,
-                )
-            )
-            if existing.first():
-                continue
-
-            db_post = RawPost(
-                source=post.source,
-                external_id=post.external_id,
-                content=post.content,
-                author_name=post.author_name,
-                author_id=post.author_id,
-                url=post.url,
-                posted_at=post.posted_at,
-                collected_at=datetime.utcnow(),
-                raw_metadata=json.dumps(post.metadata, ensure_ascii=False),
-            )
-            session.add(db_post)
-            new_count += 1
-
+        now = _utcnow()
+        rows = [
+            {
+                "source": post.source,
+                "external_id": post.external_id,
+                "content": post.content,
+                "author_name": post.author_name,
+                "author_platform_id": post.author_id,
+                "url": post.url,
+                "posted_at": post.posted_at,
+                "collected_at": now,
+                "raw_metadata": _dumps(post.metadata),
+            }
+            for post in posts
+        ]
+
+        # 一条 INSERT ... ON CONFLICT DO NOTHING 批量写入（executemany），
+        # 按 source + external_id 去重交给唯一索引；RETURNING 只回传新增行
+        result = await session.execute(
+            insert_new_posts(session).returning(RawPost.id), rows
+        )
+        new_count = len(result.all())
         await session.commit()
         return new_count
 
@@ -147,4 +178,4 @@ if __name__ == "__main__":
         help="执行一次采集后退出（不启动定时调度）",
     )
     args = parser.parse_args()
-    asyncio.run(_main(args.run_once))
+    asyncio.run(closing_shared_clients(_main(args.run_once)))
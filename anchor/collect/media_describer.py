@@ -9,20 +9,25 @@
                   若转录失败则静默跳过
 
 设计原则：
-  - 每张图片单独调用一次视觉模型，结果按序合并
+  - 每张图片单独调用一次视觉模型（并发，media_concurrency 限流），结果按序合并
+  - 同帖重复图片只描述一次；URL 无尺寸提示时 HEAD 探测，体积过小的图（头像、表情、占位图）直接跳过
   - 视频优先尝试直接下载音频；无法下载时静默降级
   - 若视觉/ASR 模型未配置或调用失败，静默返回 None（不阻断流程）
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 import tempfile
 
+import httpx
 from loguru import logger
 
+from anchor.collect._http import media_client
+from anchor.config import settings
 from anchor.llm_client import chat_completion_multimodal
 from anchor.models import RawPost
 
@@ -39,6 +44,16 @@ _IMAGE_SYSTEM = """\
 """
 
 _IMAGE_PROMPT = "请提取并描述这张图片中的所有关键信息。"
+_IMAGE_MAX_TOKENS = 600
+
+# 小于该体积的图片视为头像 / 表情 / 占位图，不值一次视觉模型调用
+_MIN_IMAGE_BYTES = 8 * 1024
+
+# URL 自带尺寸信息的正文配图（推文配图、微博大图/中图规格），无需 HEAD 探测即可判定不是小图；
+# 这些 CDN 常不返回 Content-Length 或拒绝 HEAD，探测只会白白多一次往返
+_SIZED_IMAGE_RE = re.compile(
+    r"pbs\.twimg\.com/media/|sinaimg\.cn/(?:large|original|woriginal|bmiddle|mw\d+|orj\d+)/"
+)
 
 # Whisper 单文件上传上限（字节）
 _WHISPER_MAX_BYTES = 24 * 1024 * 1024  # 24 MB
@@ -64,28 +79,29 @@ async def describe_media(post: RawPost) -> str | None:
     video_items = [item for item in items if item.get("type") == "video"]
 
     # ── 图片描述 ──────────────────────────────────────────────────────────────
-    photo_idx = 1
-    for item in photo_items:
-        url = item.get("url")
-        if not url:
+    # 各图片互不依赖，并发调用视觉模型（信号量限流，避免触发 429）；gather 保持原顺序
+    # 同一帖内重复出现的图片 URL 只描述一次（dict.fromkeys 去重且保序）
+    photo_urls = list(dict.fromkeys(item["url"] for item in photo_items if item.get("url")))
+    sem = asyncio.Semaphore(settings.media_concurrency)
+
+    async def _describe_one(idx: int, url: str) -> str | None:
+        async with sem:
+            logger.info(f"[MediaDescriber] 描述图片 {idx}/{len(photo_urls)}: {url[:80]}")
+            return await _describe_image(url, idx)
+
+    results = await asyncio.gather(
+        *(_describe_one(i, url) for i, url in enumerate(photo_urls, 1)),
+        return_exceptions=True,
+    )
+    for photo_idx, (url, text) in enumerate(zip(photo_urls, results), 1):
+        if isinstance(text, BaseException):
+            logger.warning(f"[MediaDescriber] 图片 {photo_idx} 描述异常: {text}")
             continue
-        logger.info(f"[MediaDescriber] 描述图片 {photo_idx}/{len(photo_items)}: {url[:80]}")
-        resp = await chat_completion_multimodal(
-            system=_IMAGE_SYSTEM,
-            user=_IMAGE_PROMPT,
-            image_url=url,
-            max_tokens=600,
-        )
-        if resp and resp.content.strip():
-            label = f"图{photo_idx}" if len(photo_items) > 1 else "图片"
-            descriptions.append((label, resp.content.strip()))
-            logger.debug(
-                f"[MediaDescriber] 图片 {photo_idx} 描述完成 "
-                f"(in={resp.input_tokens} out={resp.output_tokens})"
-            )
+        if text:
+            label = f"图{photo_idx}" if len(photo_urls) > 1 else "图片"
+            descriptions.append((label, text))
         else:
             logger.warning(f"[MediaDescriber] 图片 {photo_idx} 描述失败: {url[:80]}")
-        photo_idx += 1
 
     # ── 视频转录 ──────────────────────────────────────────────────────────────
     video_idx = 1
@@ -117,6 +133,68 @@ async def describe_media(post: RawPost) -> str | None:
     return "\n\n".join(f"[{label}] {text}" for label, text in descriptions)
 
 
+async def _describe_image(url: str, idx: int) -> str | None:
+    """调用视觉模型描述单张图片，失败或图片过小返回 None。
+
+    开启 llm_exact_cache 时按图片 URL 复用 llm_cache 表中的描述：
+    平台 CDN 图片 URL 与内容一一对应，转发/重跑同一图片不再重复付费。
+    """
+    key = None
+    if settings.llm_exact_cache:
+        from anchor.llm_cache import exact_get, exact_key
+        key = exact_key(
+            _IMAGE_SYSTEM, f"{_IMAGE_PROMPT}\n{url}", settings.llm_vision_model or None,
+            max_tokens=_IMAGE_MAX_TOKENS,
+        )
+        cached = await exact_get(key)
+        if cached is not None:
+            logger.debug(f"[MediaDescriber] 图片 {idx} 命中缓存")
+            return cached
+
+    if await _is_tiny_image(url):
+        logger.debug(f"[MediaDescriber] 图片 {idx} 体积过小，跳过: {url[:80]}")
+        return None
+
+    resp = await chat_completion_multimodal(
+        system=_IMAGE_SYSTEM,
+        user=_IMAGE_PROMPT,
+        image_url=url,
+        max_tokens=_IMAGE_MAX_TOKENS,
+    )
+    if not resp or not resp.content.strip():
+        return None
+    text = resp.content.strip()
+    logger.debug(
+        f"[MediaDescriber] 图片 {idx} 描述完成 "
+        f"(in={resp.input_tokens} out={resp.output_tokens})"
+    )
+    if key is not None:
+        from anchor.llm_cache import exact_put
+        await exact_put(key, text, settings.llm_vision_model or None)
+    return text
+
+
+async def _is_tiny_image(url: str) -> bool:
+    """判断是否为小图。
+
+    URL 带尺寸提示的直接按正常图处理；否则 HEAD 读取 Content-Length，
+    取不到长度（不支持 HEAD、防盗链等）时同样按正常图处理。
+    """
+    if _SIZED_IMAGE_RE.search(url):
+        return False
+    try:
+        resp = await media_client().head(url)
+    except httpx.HTTPError:
+        return False
+    if resp.status_code != 200:
+        return False
+    try:
+        size = int(resp.headers.get("Content-Length", ""))
+    except ValueError:
+        return False
+    return size < _MIN_IMAGE_BYTES
+
+
 # ---------------------------------------------------------------------------
 # 视频音频提取 + Whisper 转录
 # ---------------------------------------------------------------------------
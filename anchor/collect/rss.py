@@ -8,14 +8,24 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 
 import feedparser
 
+from anchor.collect._http import rss_client
 from anchor.collect.base import BaseCollector, RawPostData
 from anchor.config import settings
+from anchor.models import _utcnow
+
+# 同时抓取的 feed 数上限
+_MAX_CONCURRENCY = 16
+
+# 条件 GET 状态：feed URL → (etag, modified)，进程内跨轮询复用。
+# 只在条目入库成功后（mark_saved）才更新，否则写库失败后下一轮拿到 304，这批条目永远漏采
+_FEED_STATE: dict[str, tuple[str | None, str | None]] = {}
 
 
 class RSSCollector(BaseCollector):
@@ -23,6 +33,8 @@ class RSSCollector(BaseCollector):
 
     def __init__(self, feeds: list[str] | None = None) -> None:
         self._feeds = feeds or settings.rss_feed_list
+        # 本轮抓到的新校验值，待 mark_saved() 提交到 _FEED_STATE
+        self._pending_state: dict[str, tuple[str | None, str | None]] = {}
 
     @property
     def source_name(self) -> str:
@@ -33,20 +45,44 @@ class RSSCollector(BaseCollector):
 
         Args:
             feeds: 覆盖默认源列表
+
+        各源并发抓取，总耗时约为最慢的单个源；下载走共享长连接客户端，
+        feedparser 只负责解析（放线程池，不阻塞事件循环）。
         """
         feed_list = feeds or self._feeds
-        posts: list[RawPostData] = []
-        for url in feed_list:
-            posts.extend(self._fetch_feed(url))
-        return posts
-
-    def _fetch_feed(self, url: str) -> list[RawPostData]:
+        self._pending_state = {}
+        sem = asyncio.Semaphore(_MAX_CONCURRENCY)
+
+        async def _fetch(url: str) -> list[RawPostData]:
+            async with sem:
+                return await self._fetch_feed(url)
+
+        results = await asyncio.gather(*(_fetch(url) for url in feed_list))
+        return [p for r in results for p in r]
+
+    async def _fetch_feed(self, url: str) -> list[RawPostData]:
+        etag, modified = _FEED_STATE.get(url, (None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
         try:
-            parsed = feedparser.parse(url, request_headers={"User-Agent": "Anchor/1.0"})
+            resp = await rss_client().get(url, headers=headers)
+            # 304 Not Modified：源无更新，上轮条目已入库
+            if resp.status_code == 304:
+                return []
+            resp.raise_for_status()
+            parsed = await asyncio.to_thread(feedparser.parse, resp.content)
         except Exception as exc:
             print(f"[RSSCollector] failed to fetch {url!r}: {exc}")
             return []
 
+        new_etag = resp.headers.get("ETag")
+        new_modified = resp.headers.get("Last-Modified")
+        if new_etag or new_modified:
+            self._pending_state[url] = (new_etag, new_modified)
+
         posts: list[RawPostData] = []
         feed_title = parsed.feed.get("title", url)
 
@@ -56,7 +92,7 @@ class RSSCollector(BaseCollector):
                 continue
 
             posted_at = _parse_time(entry)
-            # 用 URL 或 id 字段生成稳定的 external_id
+            # 用 URL 或 id 字段生成稳定的 external_id（已入库条目按此去重，算法不可随意更换）
             link = entry.get("link", "")
             entry_id = entry.get("id", link) or link
             external_id = hashlib.sha1(entry_id.encode()).hexdigest()[:16]
@@ -76,6 +112,12 @@ class RSSCollector(BaseCollector):
         return posts
 
 
+    def mark_saved(self) -> None:
+        """条目入库成功后提交本轮的 ETag / Last-Modified，下一轮才以条件 GET 跳过未更新的源。"""
+        _FEED_STATE.update(self._pending_state)
+        self._pending_state = {}
+
+
 # ---------------------------------------------------------------------------
 # 辅助函数
 # ---------------------------------------------------------------------------
@@ -95,26 +137,33 @@ def _extract_author(entry: dict, feed_title: str) -> str:
     return author if author else feed_title
 
 
-def _parse_time(entry: dict) -> datetime:
-    """尝试多种方式解析发布时间，失败则返回 UTC 当前时间"""
-    # feedparser 解析好的结构化时间
-    if entry.get("published_parsed"):
-        import time
+# feedparser 为每个时间字段同时给出结构化（*_parsed，已归一到 UTC）和原始字符串两个版本
+_PARSED_TIME_KEYS = ("published_parsed", "updated_parsed", "created_parsed")
+_RAW_TIME_KEYS = ("published", "updated", "created")
 
-        t = entry["published_parsed"]
-        try:
-            return datetime(*t[:6])
-        except Exception:
-            pass
 
-    # 原始字符串
-    for key in ("published", "updated", "created"):
-        raw = entry.get(key, "")
+def _parse_time(entry: dict) -> datetime:
+    """尝试多种方式解析发布时间，失败则返回 UTC 当前时间。
+
+    与库内其他时间列一致，统一返回 naive UTC。优先用 feedparser 已解析好的结构化时间，
+    只有都缺失时才回退到较重的 RFC 2822 字符串解析。
+    """
+    for key in _PARSED_TIME_KEYS:
+        t = entry.get(key)
+        if t:
+            try:
+                return datetime(*t[:6])
+            except (TypeError, ValueError):
+                pass
+
+    # 原始字符串：带时区的先换算到 UTC 再去掉 tzinfo（直接去掉会丢失时差）
+    for key in _RAW_TIME_KEYS:
+        raw = entry.get(key)
         if raw:
             try:
                 dt = parsedate_to_datetime(raw)
-                return dt.replace(tzinfo=None) if dt.tzinfo else dt
-            except Exception:
-                pass
+            except (TypeError, ValueError):
+                continue
+            return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
 
-    return datetime.utcnow()
+    return _utcnow()
@@ -12,12 +12,18 @@
 from __future__ import annotations
 
 import asyncio
+import functools
 import math
 import re
-from datetime import datetime, timezone
+import weakref
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 
 import httpx
+import orjson
+from loguru import logger
 
+from anchor.collect._http import http_retry, jina_client, syndication_client, twitter_client
 from anchor.collect.base import BaseCollector, RawPostData
 from anchor.config import settings
 
@@ -34,51 +40,78 @@ _ECONOMIC_KEYWORDS = [
     "黄金 OR 原油 看多 OR 看空",
 ]
 
+
+def _search_query(keyword: str) -> str:
+    """关键词 → 搜索查询（排除转推，限中文）"""
+    return f"({keyword}) -is:retweet lang:zh"
+
+
+# 默认关键词的完整查询在导入时拼好，每轮采集直接复用
+_ECONOMIC_QUERIES = tuple(_search_query(k) for k in _ECONOMIC_KEYWORDS)
+
 _SYNDICATION_URL = "https://cdn.syndication.twimg.com/tweet-result"
+_SYNDICATION_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    # Syndication API 需要来自 platform.twitter.com 的 Referer
+    "Referer": "https://platform.twitter.com/",
+    "Origin": "https://platform.twitter.com",
+}
+
+# X 长文经 Jina Reader 抓取全文时同时进行的请求数（免费额度有速率限制）
+_JINA_CONCURRENCY = 2
+_jina_sems: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
+
+# 推文正文中的 t.co 短链
+_TCO_RE = re.compile(r"https?://t\.co/\w+", re.ASCII)
+
+# 按 ID 批量抓取时同时进行的 Syndication 请求数（CDN 有频率限制）
+_MAX_CONCURRENCY = 8
+
 
+_B36 = "0123456789abcdefghijklmnopqrstuvwxyz"
 
+
+@functools.lru_cache(maxsize=4096)
 def _get_syndication_token(tweet_id: str) -> str:
     """计算 Syndication API 所需的 token。
 
     公式来自 Vercel react-tweet 逆向工程，经 yt-dlp 验证（2025）：
-      token = ((id / 1e15) * π).toString(36).replace(/(0+|\\.)/g, '')
+      token = ((id / 1e15) * π).toString(36).replace(/(0+|\.)/g, '')
 
-    直接传 token=0 在较新推文上已失效。
+    直接传 token=0 在较新推文上已失效。JS 的 replace 去掉的是所有 0 和小数点（不只是前导 0），
+    故小数点不必写入，最后整体去掉 "0" 即可，无需正则。
     """
     val = (int(tweet_id) / 1e15) * math.pi
-    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
     integer = int(val)
     frac = val - integer
-    parts: list[str] = []
-    while integer > 0:
-        parts.insert(0, chars[integer % 36])
-        integer //= 36
-    if not parts:
-        parts = ["0"]
-    if frac > 0:
-        parts.append(".")
-        for _ in range(10):
-            frac *= 36
-            d = int(frac)
-            parts.append(chars[d])
-            frac -= d
-    return re.sub(r"(0+|\.)", "", "".join(parts))
+    digits: list[str] = []
+    while integer:
+        integer, d = divmod(integer, 36)
+        digits.append(_B36[d])
+    digits.reverse()
+    for _ in range(10):
+        frac *= 36
+        d = int(frac)
+        digits.append(_B36[d])
+        frac -= d
+    return "".join(digits).replace("0", "")
 
 
 class TwitterCollector(BaseCollector):
     """Twitter/X 采集器，支持 API 模式（需 token）和 Syndication 模式（无需 token）。"""
 
     def __init__(self, keywords: list[str] | None = None) -> None:
-        self._use_api = bool(settings.twitter_bearer_token)
-        if self._use_api:
-            import tweepy
-            self._client = tweepy.AsyncClient(
-                bearer_token=settings.twitter_bearer_token,
-                wait_on_rate_limit=True,
-            )
-        else:
-            self._client = None
-        self._keywords = keywords or _ECONOMIC_KEYWORDS
+        # 与评论采集、上下文补全共用进程内的 tweepy 客户端；未配置 token 时为 None
+        self._client = twitter_client()
+        self._use_api = self._client is not None
+        self._queries = (
+            tuple(_search_query(k) for k in keywords) if keywords else _ECONOMIC_QUERIES
+        )
 
     @property
     def source_name(self) -> str:
@@ -125,9 +158,9 @@ class TwitterCollector(BaseCollector):
         max_results = max_results or min(settings.collector_max_results_per_query, 100)
         posts: list[RawPostData] = []
 
-        for query in keywords or self._keywords:
-            full_query = f"({query}) -is:retweet lang:zh"
-            posts.extend(await self._search(full_query, max_results))
+        queries = [_search_query(k) for k in keywords] if keywords else self._queries
+        for query in queries:
+            posts.extend(await self._search(query, max_results))
 
         if user_ids:
             for uid in user_ids:
@@ -149,7 +182,7 @@ class TwitterCollector(BaseCollector):
             )
             return self._parse_response(response)
         except Exception as exc:
-            print(f"[TwitterCollector] get_tweets API failed: {exc}")
+            logger.warning("[TwitterCollector] get_tweets API failed: {}", exc)
             return []
 
     async def _search(self, query: str, max_results: int) -> list[RawPostData]:
@@ -163,7 +196,7 @@ class TwitterCollector(BaseCollector):
                 user_fields=["username", "name"],
             )
         except Exception as exc:
-            print(f"[TwitterCollector] search failed for query={query!r}: {exc}")
+            logger.warning("[TwitterCollector] search failed for query={!r}: {}", query, exc)
             return []
         return self._parse_response(response)
 
@@ -176,7 +209,7 @@ class TwitterCollector(BaseCollector):
                 exclude=["retweets", "replies"],
             )
         except Exception as exc:
-            print(f"[TwitterCollector] timeline failed for user_id={user_id!r}: {exc}")
+            logger.warning("[TwitterCollector] timeline failed for user_id={!r}: {}", user_id, exc)
             return []
         return self._parse_response(response)
 
@@ -192,7 +225,7 @@ class TwitterCollector(BaseCollector):
                 min(settings.collector_max_results_per_query, 100),
             )
         except Exception as exc:
-            print(f"[TwitterCollector] user timeline by username failed for {username!r}: {exc}")
+            logger.warning("[TwitterCollector] user timeline by username failed for {!r}: {}", username, exc)
             return []
 
     async def _fetch_conversation(
@@ -208,7 +241,7 @@ class TwitterCollector(BaseCollector):
             )
             return self._parse_response(response)
         except Exception as exc:
-            print(f"[TwitterCollector] conversation fetch failed for {tweet_id!r}: {exc}")
+            logger.warning("[TwitterCollector] conversation fetch failed for {!r}: {}", tweet_id, exc)
             return []
 
     def _parse_response(self, response) -> list[RawPostData]:
@@ -220,14 +253,15 @@ class TwitterCollector(BaseCollector):
             for user in response.includes["users"]:
                 user_map[str(user.id)] = user.username
 
+        # created_at 缺失时的兜底时间整批共用；tweepy 返回的 created_at 为 aware UTC，统一转 naive UTC
+        now = datetime.utcnow()
         posts: list[RawPostData] = []
         for tweet in response.data:
             author_id = str(tweet.author_id) if tweet.author_id else None
             author_name = user_map.get(author_id or "", author_id or "unknown")
             metrics = tweet.public_metrics or {}
-            posted_at: datetime = tweet.created_at or datetime.now(timezone.utc)
-            if posted_at.tzinfo is not None:
-                posted_at = posted_at.replace(tzinfo=None)
+            created_at = tweet.created_at
+            posted_at = created_at.replace(tzinfo=None) if created_at else now
 
             posts.append(
                 RawPostData(
@@ -252,13 +286,16 @@ class TwitterCollector(BaseCollector):
     # ------------------------------------------------------------------
 
     async def _collect_by_ids_syndication(self, tweet_ids: list[str]) -> list[RawPostData]:
-        posts: list[RawPostData] = []
-        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
-            for tweet_id in tweet_ids:
-                post = await _fetch_syndication(client, tweet_id)
-                if post:
-                    posts.append(post)
-        return posts
+        # 各条推文互不依赖，并发抓取（信号量限流）；gather 保持原顺序
+        sem = asyncio.Semaphore(_MAX_CONCURRENCY)
+
+        async def _one(tweet_id: str) -> RawPostData | None:
+            async with sem:
+                return await _fetch_syndication(client, tweet_id)
+
+        client = syndication_client()
+        results = await asyncio.gather(*(_one(tid) for tid in tweet_ids))
+        return [post for post in results if post]
 
 
 # ---------------------------------------------------------------------------
@@ -290,20 +327,48 @@ async def _fetch_article_full_content(
         headers["X-Set-Cookie"] = f"auth_token={auth_token}; ct0={ct0}"
 
     try:
-        # 必须用独立的新 client，不能复用外层 client（外层已连接 Twitter CDN，
+        # 必须用独立的 Jina client，不能复用外层 client（外层已连接 Twitter CDN，
         # 共用会导致 Jina 返回 403）。
-        # 短暂延迟以避免 Syndication 请求后立即触发 Jina 速率限制
-        await asyncio.sleep(1)
-        async with httpx.AsyncClient(timeout=45) as jina_client:
-            resp = await jina_client.get(jina_url, headers=headers)
-            text = resp.text.strip() if resp.status_code == 200 else ""
+        # 以并发上限代替固定延迟控制 Jina 速率；偶发 429 由 http_retry 按 Retry-After 退避
+        async with _jina_semaphore():
+            resp = await _get_jina(jina_url, headers)
+        text = resp.text.strip()
         if len(text) > 200 and "Sign in" not in text[:300]:
             return text
     except Exception as exc:
-        print(f"[TwitterCollector] Jina reader fetch failed for {article_url}: {exc}")
+        logger.warning("[TwitterCollector] Jina reader fetch failed for {}: {}", article_url, exc)
     return None
 
 
+@http_retry
+async def _get_jina(url: str, headers: dict[str, str]) -> httpx.Response:
+    resp = await jina_client().get(url, headers=headers)
+    resp.raise_for_status()
+    return resp
+
+
+def _jina_semaphore() -> asyncio.Semaphore:
+    """当前事件循环共享的 Jina 并发信号量（Semaphore 绑定事件循环，按循环缓存）。"""
+    loop = asyncio.get_running_loop()
+    sem = _jina_sems.get(loop)
+    if sem is None:
+        sem = _jina_sems[loop] = asyncio.Semaphore(_JINA_CONCURRENCY)
+    return sem
+
+
+@http_retry
+async def _get_syndication(client: httpx.AsyncClient, tweet_id: str) -> httpx.Response:
+    """请求 Syndication API；429 / 5xx / 网络错误按 http_retry 退避重试，404 原样返回。"""
+    resp = await client.get(
+        _SYNDICATION_URL,
+        params={"id": tweet_id, "lang": "en", "token": _get_syndication_token(tweet_id)},
+        headers=_SYNDICATION_HEADERS,
+    )
+    if resp.status_code != 404:
+        resp.raise_for_status()
+    return resp
+
+
 async def _fetch_syndication(
     client: httpx.AsyncClient, tweet_id: str
 ) -> RawPostData | None:
@@ -311,30 +376,16 @@ async def _fetch_syndication(
 
     token 使用 Vercel react-tweet 逆向出的计算公式，直接传 0 在新推文上已不可靠。
     """
-    token = _get_syndication_token(tweet_id)
     try:
-        resp = await client.get(
-            _SYNDICATION_URL,
-            params={"id": tweet_id, "lang": "en", "token": token},
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                ),
-                # Syndication API 需要来自 platform.twitter.com 的 Referer
-                "Referer": "https://platform.twitter.com/",
-                "Origin": "https://platform.twitter.com",
-            },
-        )
+        resp = await _get_syndication(client, tweet_id)
         if resp.status_code == 404:
-            print(f"[TwitterCollector] tweet {tweet_id} not found (404)")
+            logger.info("[TwitterCollector] tweet {} not found (404)", tweet_id)
             return None
-        resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         # 推文已删除或账号被封
         if data.get("tombstone") or data.get("notFound"):
-            print(f"[TwitterCollector] tweet {tweet_id} tombstoned or not found")
+            logger.info("[TwitterCollector] tweet {} tombstoned or not found", tweet_id)
             return None
 
         # X Article：尝试通过 Jina Reader 获取全文
@@ -348,7 +399,7 @@ async def _fetch_syndication(
 
         return _parse_syndication_data(data, full_article_content)
     except Exception as exc:
-        print(f"[TwitterCollector] syndication fetch failed for {tweet_id}: {exc}")
+        logger.warning("[TwitterCollector] syndication fetch failed for {}: {}", tweet_id, exc)
         return None
 
 
@@ -388,9 +439,10 @@ def _parse_syndication_data(data: dict, full_article_content: str | None = None)
         else:
             text = data.get("text", "")
             entities = data.get("entities", {})
-        # 展开 t.co 短链为实际 URL
-        for u in entities.get("urls", []):
-            text = text.replace(u["url"], u["expanded_url"])
+        # 展开 t.co 短链为实际 URL：一趟扫描，按短链查表替换
+        tco_map = {u["url"]: u["expanded_url"] for u in entities.get("urls", [])}
+        if tco_map:
+            text = _TCO_RE.sub(lambda m: tco_map.get(m.group(0), m.group(0)), text)
         content = text
 
     # ── 提取媒体（图片、视频）────────────────────────────────────────────────
@@ -403,10 +455,15 @@ def _parse_syndication_data(data: dict, full_article_content: str | None = None)
                 # :orig 后缀获取原始尺寸
                 media_items.append({"type": "photo", "url": url + ":orig"})
         elif mtype in ("video", "animated_gif"):
-            variants = m.get("video_info", {}).get("variants", [])
-            mp4_variants = [v for v in variants if v.get("content_type") == "video/mp4"]
-            if mp4_variants:
-                best = max(mp4_variants, key=lambda v: v.get("bitrate", 0))
+            # 一趟扫描取码率最高的 mp4 版本（m3u8 等其他格式跳过）
+            best = None
+            best_bitrate = -1
+            for v in m.get("video_info", {}).get("variants", []):
+                if v.get("content_type") == "video/mp4":
+                    bitrate = v.get("bitrate", 0)
+                    if bitrate > best_bitrate:
+                        best, best_bitrate = v, bitrate
+            if best is not None:
                 media_items.append({
                     "type": "video" if mtype == "video" else "gif",
                     "url": best["url"],
@@ -435,15 +492,15 @@ def _parse_tweet_time(raw: str) -> datetime:
     """解析推文时间，支持 ISO 8601（Syndication API）和 RFC 2822（官方 API）两种格式。"""
     if not raw:
         return datetime.utcnow()
-    # ISO 8601: "2026-02-24T12:12:41.000Z"
-    try:
-        dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
-        return dt.replace(tzinfo=None)
-    except ValueError:
-        pass
+    # ISO 8601: "2026-02-24T12:12:41.000Z"（以数字开头；RFC 2822 以星期开头，不必先试 ISO 再抛异常）
+    if raw[0].isdigit():
+        try:
+            dt = datetime.fromisoformat(raw.replace("Z", "+00:00"))
+            return dt.replace(tzinfo=None)
+        except ValueError:
+            pass
     # RFC 2822: "Mon, 24 Feb 2026 12:12:41 +0000"
     try:
-        from email.utils import parsedate_to_datetime
         return parsedate_to_datetime(raw).replace(tzinfo=None)
-    except Exception:
+    except (TypeError, ValueError):
         return datetime.utcnow()
@@ -15,14 +15,26 @@
 
 from __future__ import annotations
 
-import json
+import asyncio
+import html
 import random
 import re
+import time
+import weakref
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from typing import Any
 
 import httpx
+import orjson
+from loguru import logger
 
+try:  # 可选依赖（pip install anchor[html]）：C 实现的 HTML 解析，未安装时退回正则
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+from anchor.collect._http import _HTTP2
 from anchor.collect.base import BaseCollector, RawPostData
 from anchor.config import settings
 
@@ -38,6 +50,25 @@ _WEIBO_TOPICS = [
     "美股分析",
 ]
 
+# 同时进行的请求数（按 ID 抓取 / 长文补全 / 话题搜索各自限流；微博接口有频率限制）
+_MAX_CONCURRENCY = 8
+
+# genvisitor 浏览器指纹（固定值，紧凑 JSON）
+_VISITOR_FP = orjson.dumps(
+    {
+        "os": "1",
+        "browser": "Chrome120,0,0,0",
+        "fonts": "undefined",
+        "screenInfo": "1920*1080*24",
+        "plugins": "",
+    }
+).decode()
+
+# 访客 Cookie 有效期（保守估计）；过期后在共享客户端上重新走 genvisitor 流程
+_VISITOR_COOKIE_TTL = 30 * 60
+# 访客 Cookie 获取失败后的重试间隔，避免每个请求都去打 passport.weibo.com
+_VISITOR_RETRY_INTERVAL = 60
+
 _BASE_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -60,31 +91,24 @@ async def _generate_visitor_cookies(client: httpx.AsyncClient) -> None:
             "https://passport.weibo.com/visitor/genvisitor",
             data={
                 "cb": "gen_callback",
-                "fp": json.dumps(
-                    {
-                        "os": "1",
-                        "browser": "Chrome120,0,0,0",
-                        "fonts": "undefined",
-                        "screenInfo": "1920*1080*24",
-                        "plugins": "",
-                    },
-                    separators=(",", ":"),
-                ),
+                "fp": _VISITOR_FP,
             },
         )
-        # 响应为 JSONP 格式：gen_callback({...})
-        m = re.search(r"gen_callback\((.*)\)", resp.text)
-        if not m:
-            print("[WeiboCollector] genvisitor: unexpected response format")
+        # 响应为 JSONP 格式：gen_callback({...})，直接按括号切出 JSON 字节
+        body = resp.content
+        start = body.find(b"gen_callback(")
+        end = body.rfind(b")")
+        if start < 0 or end <= start:
+            logger.warning("[WeiboCollector] genvisitor: unexpected response format")
             return
-        payload = json.loads(m.group(1))
+        payload = orjson.loads(body[start + len(b"gen_callback("):end])
         data_part = payload.get("data", {})
         tid = data_part.get("tid", "")
         confidence = data_part.get("confidence", 100)
         new_tid = data_part.get("new_tid", False)
         w = 3 if new_tid else 2
         if not tid:
-            print("[WeiboCollector] genvisitor: no tid in response")
+            logger.warning("[WeiboCollector] genvisitor: no tid in response")
             return
 
         # incarnate：激活访客 session，服务器 Set-Cookie 写入 client.cookies
@@ -102,9 +126,9 @@ async def _generate_visitor_cookies(client: httpx.AsyncClient) -> None:
                 "_rand": random.random(),
             },
         )
-        print("[WeiboCollector] visitor cookies acquired")
+        logger.info("[WeiboCollector] visitor cookies acquired")
     except Exception as exc:
-        print(f"[WeiboCollector] visitor cookie generation failed: {exc}")
+        logger.warning("[WeiboCollector] visitor cookie generation failed: {}", exc)
 
 
 class WeiboCollector(BaseCollector):
@@ -114,6 +138,14 @@ class WeiboCollector(BaseCollector):
         self._topics = topics or _WEIBO_TOPICS
         # 优先使用账号 Cookie；为空则走访客模式
         self._weibo_cookie = settings.weibo_cookie
+        # 事件循环 → 共享客户端；AsyncClient 绑定创建它的循环，按循环缓存
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, httpx.AsyncClient
+        ] = weakref.WeakKeyDictionary()
+        # 访客 Cookie 缓存在实例上（跨客户端 / 跨循环复用），过期前不重复获取
+        self._visitor_cookies: httpx.Cookies | None = None
+        self._visitor_expiry = 0.0
+        self._visitor_refresh: asyncio.Task | None = None
 
     @property
     def source_name(self) -> str:
@@ -125,23 +157,57 @@ class WeiboCollector(BaseCollector):
             h["Cookie"] = self._weibo_cookie
         return h
 
+    async def _ensure_client(self) -> httpx.AsyncClient:
+        """返回当前事件循环共享的长连接客户端；访客模式下保证访客 Cookie 未过期。"""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            fresh = time.monotonic() < self._visitor_expiry
+            client = httpx.AsyncClient(
+                http2=_HTTP2,
+                timeout=20,
+                follow_redirects=True,
+                headers=self._make_headers(),
+                cookies=self._visitor_cookies if fresh else None,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+            self._clients[loop] = client
+        if not self._weibo_cookie and time.monotonic() >= self._visitor_expiry:
+            await self._refresh_visitor_cookies(client)
+        return client
+
+    async def _refresh_visitor_cookies(self, client: httpx.AsyncClient) -> None:
+        """重新获取访客 Cookie；并发调用方等待同一次刷新，genvisitor 流程只跑一次。"""
+        task = self._visitor_refresh
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._visitor_refresh = asyncio.ensure_future(self._fetch_visitor_cookies(client))
+        await task
+
+    async def _fetch_visitor_cookies(self, client: httpx.AsyncClient) -> None:
+        client.cookies.clear()
+        await _generate_visitor_cookies(client)
+        now = time.monotonic()
+        if client.cookies:
+            self._visitor_cookies = httpx.Cookies(client.cookies)
+            self._visitor_expiry = now + _VISITOR_COOKIE_TTL
+        else:
+            self._visitor_expiry = now + _VISITOR_RETRY_INTERVAL
+
+    async def aclose(self) -> None:
+        """关闭当前事件循环上的共享客户端。"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
     # ------------------------------------------------------------------
     # 公开接口
     # ------------------------------------------------------------------
 
     async def collect_by_ids(self, weibo_ids: list[str]) -> list[RawPostData]:
         """按微博 ID（mid 或 bid）列表抓取单条微博。"""
-        posts: list[RawPostData] = []
-        async with httpx.AsyncClient(
-            timeout=20, follow_redirects=True, headers=self._make_headers()
-        ) as client:
-            if not self._weibo_cookie:
-                await _generate_visitor_cookies(client)
-            for wid in weibo_ids:
-                post = await self._fetch_post(client, wid)
-                if post:
-                    posts.append(post)
-        return posts
+        client = await self._ensure_client()
+        results = await self._fetch_posts(client, weibo_ids)
+        return [post for post in results if post]
 
     async def collect(
         self,
@@ -150,22 +216,36 @@ class WeiboCollector(BaseCollector):
         **_: Any,
     ) -> list[RawPostData]:
         """批量采集：话题搜索 + 指定用户时间线。"""
-        posts: list[RawPostData] = []
-        async with httpx.AsyncClient(
-            timeout=20, follow_redirects=True, headers=self._make_headers()
-        ) as client:
-            if not self._weibo_cookie:
-                await _generate_visitor_cookies(client)
-            for topic in topics or self._topics:
-                posts.extend(await self._search_topic(client, topic))
-            for uid in uids or []:
-                posts.extend(await self._fetch_user_timeline(client, uid))
-        return posts
+        client = await self._ensure_client()
+        # 各话题搜索 / 用户时间线互不依赖，并发请求（信号量限流）；gather 保持原顺序
+        sem = asyncio.Semaphore(_MAX_CONCURRENCY)
+
+        async def _bounded(coro):
+            async with sem:
+                return await coro
+
+        results = await asyncio.gather(
+            *(_bounded(self._search_topic(client, t)) for t in topics or self._topics),
+            *(_bounded(self._fetch_user_timeline(client, uid)) for uid in uids or []),
+        )
+        return [post for r in results for post in r]
 
     # ------------------------------------------------------------------
     # 内部实现
     # ------------------------------------------------------------------
 
+    async def _fetch_posts(
+        self, client: httpx.AsyncClient, weibo_ids: list[str]
+    ) -> list[RawPostData | None]:
+        """并发抓取多条微博（信号量限流），结果与 weibo_ids 一一对应，失败为 None。"""
+        sem = asyncio.Semaphore(_MAX_CONCURRENCY)
+
+        async def _one(wid: str) -> RawPostData | None:
+            async with sem:
+                return await self._fetch_post(client, wid)
+
+        return await asyncio.gather(*(_one(wid) for wid in weibo_ids))
+
     async def _fetch_post(
         self, client: httpx.AsyncClient, weibo_id: str
     ) -> RawPostData | None:
@@ -180,7 +260,7 @@ class WeiboCollector(BaseCollector):
                 params={"id": weibo_id},
             )
             resp.raise_for_status()
-            status = resp.json()
+            status = orjson.loads(resp.content)
 
             # 超长微博：text_raw 仍被截断，需调用 longtext 端点
             # longtext 端点需要 bid（base62），不接受 mid（数字）
@@ -193,17 +273,17 @@ class WeiboCollector(BaseCollector):
                     )
                     if lt_resp.status_code == 200:
                         full_text = (
-                            lt_resp.json().get("data", {}).get("longTextContent", "")
+                            orjson.loads(lt_resp.content).get("data", {}).get("longTextContent", "")
                         )
                         if full_text:
                             # longTextContent 含 HTML（<a>、<br/> 等），需过滤
                             status["text_raw"] = _strip_html(full_text)
                 except Exception as lt_exc:
-                    print(f"[WeiboCollector] longtext fetch failed for {longtext_id!r}: {lt_exc}")
+                    logger.warning("[WeiboCollector] longtext fetch failed for {!r}: {}", longtext_id, lt_exc)
 
             return self._parse_status(status)
         except Exception as exc:
-            print(f"[WeiboCollector] fetch post failed for {weibo_id!r}: {exc}")
+            logger.warning("[WeiboCollector] fetch post failed for {!r}: {}", weibo_id, exc)
             return None
 
     async def _search_topic(
@@ -222,23 +302,30 @@ class WeiboCollector(BaseCollector):
                 },
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except Exception as exc:
-            print(f"[WeiboCollector] search failed for {keyword!r}: {exc}")
+            logger.warning("[WeiboCollector] search failed for {!r}: {}", keyword, exc)
             return []
 
-        posts: list[RawPostData] = []
-        for card in data.get("data", {}).get("cards", []):
-            for mblog in _iter_mblogs(card):
-                mid = str(mblog.get("mid", mblog.get("id", "")))
-                # 长文被截断：通过 ajax API 获取 text_raw 完整内容
-                if mblog.get("isLongText") or mblog.get("longText"):
-                    full = await self._fetch_post(client, mid)
-                    if full:
-                        posts.append(full)
-                        continue
-                posts.append(self._parse_mblog(mblog))
-        return posts
+        mblogs = [
+            mblog
+            for card in data.get("data", {}).get("cards", [])
+            for mblog in _card_mblogs(card)
+        ]
+        # 长文被截断：通过 ajax API 获取 text_raw 完整内容（并发抓取，失败回退到搜索结果）
+        long_idx = [
+            i for i, mblog in enumerate(mblogs)
+            if mblog.get("isLongText") or mblog.get("longText")
+        ]
+        full_posts = await self._fetch_posts(
+            client,
+            [str(mblogs[i].get("mid", mblogs[i].get("id", ""))) for i in long_idx],
+        )
+        full_by_idx = dict(zip(long_idx, full_posts))
+        return [
+            full_by_idx.get(i) or self._parse_mblog(mblog)
+            for i, mblog in enumerate(mblogs)
+        ]
 
     async def _fetch_user_timeline(
         self, client: httpx.AsyncClient, uid: str
@@ -250,9 +337,9 @@ class WeiboCollector(BaseCollector):
                 params={"uid": uid},
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
         except Exception as exc:
-            print(f"[WeiboCollector] user timeline failed for uid={uid!r}: {exc}")
+            logger.warning("[WeiboCollector] user timeline failed for uid={!r}: {}", uid, exc)
             return []
 
         return [self._parse_status(s) for s in data.get("statuses", []) if s]
@@ -314,20 +401,27 @@ class WeiboCollector(BaseCollector):
 # ---------------------------------------------------------------------------
 
 
+# 只读的空 dict 兜底，避免每次 .get(..., {}) 都新建
+_EMPTY: dict = {}
+
+
 def _extract_weibo_media(status: dict) -> list[dict]:
     """从微博 status/mblog 对象中提取图片和视频 URL 列表。"""
     items: list[dict] = []
 
-    # 图片：pic_ids 决定顺序，pic_infos 提供 URL
-    pic_ids = status.get("pic_ids", [])
-    pic_infos = status.get("pic_infos", {})
-    for pid in pic_ids:
-        info = pic_infos.get(pid, {})
-        # 按画质从高到低依次尝试
-        source = info.get("original") or info.get("large") or info.get("bmiddle") or {}
-        url = source.get("url", "")
-        if url:
-            items.append({"type": "photo", "url": url})
+    # 图片：pic_ids 决定顺序，pic_infos 提供 URL（多数微博无图，直接跳过）
+    pic_ids = status.get("pic_ids")
+    if pic_ids:
+        pic_infos = status.get("pic_infos") or _EMPTY
+        for pid in pic_ids:
+            info = pic_infos.get(pid)
+            if not info:
+                continue
+            # 按画质从高到低依次尝试
+            source = info.get("original") or info.get("large") or info.get("bmiddle") or _EMPTY
+            url = source.get("url")
+            if url:
+                items.append({"type": "photo", "url": url})
 
     # 视频：page_info.type == "video"
     page_info = status.get("page_info") or {}
@@ -344,28 +438,48 @@ def _extract_weibo_media(status: dict) -> list[dict]:
     return items
 
 
-def _iter_mblogs(card: dict):
-    """从 card 对象中递归提取 mblog（支持嵌套 card_group）。"""
+def _card_mblogs(card: dict) -> list[dict]:
+    """从 card 对象中提取 mblog（含一层嵌套 card_group），返回列表。"""
+    mblogs = [sub["mblog"] for sub in card.get("card_group", ()) if sub.get("mblog")]
     mblog = card.get("mblog")
     if mblog:
-        yield mblog
-    for sub in card.get("card_group", []):
-        sub_mblog = sub.get("mblog")
-        if sub_mblog:
-            yield sub_mblog
+        mblogs.insert(0, mblog)
+    return mblogs
+
+
+# 微博 created_at 固定格式，如 "Wed Feb 26 10:00:00 +0800 2026"
+_WEIBO_TIME_FMT = "%a %b %d %H:%M:%S %z %Y"
 
 
 def _parse_weibo_time(raw: str) -> datetime:
-    """解析微博时间格式，如 'Wed Feb 26 10:00:00 +0800 2026'"""
+    """解析微博时间格式，如 'Wed Feb 26 10:00:00 +0800 2026'
+
+    固定格式先走 strptime，不符合时再回退到通用的 RFC 2822 解析。
+    """
     if not raw:
         return datetime.utcnow()
     try:
-        from email.utils import parsedate_to_datetime
+        return datetime.strptime(raw, _WEIBO_TIME_FMT).replace(tzinfo=None)
+    except ValueError:
+        pass
+    try:
         return parsedate_to_datetime(raw).replace(tzinfo=None)
-    except Exception:
+    except (TypeError, ValueError):
         return datetime.utcnow()
 
 
+_TAG_RE = re.compile(r"<[^>]+>")
+_BR_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+
+
 def _strip_html(text: str) -> str:
-    """去除 HTML 标签（微博搜索结果的 text 字段含 <a> 等标签）"""
-    return re.sub(r"<[^>]+>", "", text).strip()
+    """去除 HTML 标签并解码实体（微博 text / longTextContent 含 <a>、<br/>、&amp; 等）
+
+    <br> 换成换行以保留分段；装有 selectolax 时用其解析，否则正则去标签 + html.unescape。
+    """
+    if not text:
+        return ""
+    text = _BR_RE.sub("\n", text)
+    if HTMLParser is not None:
+        return HTMLParser(text).text().strip()
+    return html.unescape(_TAG_RE.sub("", text)).strip()
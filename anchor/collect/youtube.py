@@ -8,7 +8,8 @@
   Layer B — 音频转录（pytubefix + PyAV + Whisper）
     当视频无字幕时启用。
     pytubefix 无需 PO Token，直接访问 YouTube 内部 API。
-    PyAV（内嵌 FFmpeg）从下载文件中抽取音频，重编码为 16kHz mono m4a。
+    下载最低码率的 m4a 音频流，时长与大小在限制内时原样上传；
+    超长时由 PyAV（内嵌 FFmpeg）复制截断；长音频切段后并发调用转录。
     Whisper 兼容 API 完成转录。
     需配置 ASR_API_KEY 或 LLM_API_KEY。
 
@@ -20,6 +21,10 @@
   ASR_BASE_URL=                    # 可选，替换为 Groq 等端点
   ASR_MODEL=whisper-1              # 默认 whisper-1；Groq 用 whisper-large-v3-turbo
   YOUTUBE_MAX_DURATION=1800        # 最长转录时长（秒），0=不限制，默认 30 分钟
+  ASR_CHUNK_SECONDS=300            # 长音频切段并发转录，每段秒数；0=整段上传
+  ASR_CONCURRENCY=6                # 同时进行的转录请求数
+  YOUTUBE_CONCURRENCY=4            # 批量采集时同时处理的视频数
+  YOUTUBE_CACHE_DAYS=30            # 元数据缓存天数（字幕/转录不过期），0=不缓存
 
 支持的 URL 格式：
   https://www.youtube.com/watch?v=VIDEO_ID
@@ -29,14 +34,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
+import math
 import os
 import re
+import shutil
 import tempfile
 from datetime import datetime, timezone
 
 import httpx
+import orjson
 from loguru import logger
 
+try:  # 可选依赖：未安装时跳过 Layer A
+    from youtube_transcript_api import YouTubeTranscriptApi
+except ImportError:
+    YouTubeTranscriptApi = None
+
+from anchor.collect._http import youtube_client
+from anchor.collect.api_cache import cache_get, cache_key, cache_put
 from anchor.collect.base import BaseCollector, RawPostData
 from anchor.config import settings
 
@@ -99,14 +116,14 @@ def _looks_like_name(s: str) -> bool:
     return False
 
 
-_YT_HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/122.0.0.0 Safari/537.36"
-    ),
-    "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-}
+# pytubefix（带 JS 解释器）与 PyAV 导入较重，bilibili 采集器也会导入本模块：
+# 加载时只探测是否安装，用到时才导入；缺任一则直接跳过 Layer B，而不是每个视频都导入失败一次
+_HAS_PYTUBEFIX = importlib.util.find_spec("pytubefix") is not None
+_HAS_AV = importlib.util.find_spec("av") is not None
+
+_SUBTITLE_PREFERENCE = ("zh-Hans", "zh-Hant", "zh", "en")
+# 连续重复的 [Music] / [音乐] 等标注合并为一个
+_DEDUP_BRACKETS_RE = re.compile(r"(\[[^\]]+\])(?:\s*\1)+")
 
 # Whisper API 单文件上传上限（字节）
 _WHISPER_MAX_BYTES = 24 * 1024 * 1024   # 24 MB 留一点余量
@@ -123,12 +140,27 @@ class YouTubeCollector(BaseCollector):
         return await self.collect_by_ids(kwargs.get("video_ids", []))
 
     async def collect_by_ids(self, video_ids: list[str]) -> list[RawPostData]:
+        """并发采集多个视频；各视频互不依赖，同时在途数受 youtube_concurrency 限制。
+
+        元数据回落请求走事件循环内共享的 youtube_client，跨批次复用长连接（装有 h2 时走 HTTP/2）。
+        """
+        client = youtube_client()
+        sem = asyncio.Semaphore(max(1, settings.youtube_concurrency))
+
+        async def _fetch(vid: str, client: httpx.AsyncClient) -> RawPostData | None:
+            async with sem:
+                return await self._fetch_video(vid, client)
+
+        fetched = await asyncio.gather(
+            *(_fetch(vid, client) for vid in video_ids), return_exceptions=True
+        )
+
         results = []
-        async with httpx.AsyncClient(timeout=20, headers=_YT_HEADERS) as client:
-            for vid in video_ids:
-                data = await self._fetch_video(vid, client)
-                if data:
-                    results.append(data)
+        for vid, data in zip(video_ids, fetched):
+            if isinstance(data, BaseException):
+                logger.warning("[YouTube] video_id={} 采集失败: {}", vid, data)
+            elif data:
+                results.append(data)
         return results
 
     # ------------------------------------------------------------------
@@ -141,9 +173,12 @@ class YouTubeCollector(BaseCollector):
         video_url = f"https://www.youtube.com/watch?v={video_id}"
 
         # ── 元数据 ────────────────────────────────────────────────────
-        title, author_name, channel_id, duration_s, publish_date = await self._fetch_metadata(
-            video_id, client
-        )
+        metadata = await _cache_get_metadata(video_id)
+        if metadata is None:
+            metadata = await self._fetch_metadata(video_id, client)
+            if metadata[0]:
+                await _cache_put_metadata(video_id, metadata)
+        title, author_name, channel_id, duration_s, publish_date = metadata
         title        = title or video_id
         channel_name = author_name or "Unknown"
         channel_id   = channel_id or video_id
@@ -152,18 +187,28 @@ class YouTubeCollector(BaseCollector):
         speaker = _extract_speaker_from_title(title)
         author_name = speaker if speaker else channel_name
 
-        # ── Layer A: 字幕 ─────────────────────────────────────────────
-        transcript, method = await self._fetch_subtitle(video_id)
-
-        # ── Layer B: 音频转录（无字幕时） ────────────────────────────
+        # ── 缓存：此前已取得字幕/转录则跳过 Layer A/B ──────────────────
+        transcript, method = await _cache_get_transcript(video_id)
         if not transcript:
-            has_asr_key = bool(settings.asr_api_key or settings.llm_api_key)
-            if has_asr_key:
-                transcript, method = await self._transcribe_via_audio(video_id)
-            else:
-                logger.debug(
-                    f"[YouTube] video_id={video_id} 无字幕且未配置 ASR key，跳过音频转录"
-                )
+            # ── Layer A: 字幕 ─────────────────────────────────────────
+            transcript, method = await self._fetch_subtitle(video_id)
+
+            # ── Layer B: 音频转录（无字幕时） ────────────────────────
+            if not transcript:
+                has_asr_key = bool(settings.asr_api_key or settings.llm_api_key)
+                if not has_asr_key:
+                    logger.debug(
+                        f"[YouTube] video_id={video_id} 无字幕且未配置 ASR key，跳过音频转录"
+                    )
+                elif not (_HAS_PYTUBEFIX and _HAS_AV):
+                    logger.debug(
+                        f"[YouTube] video_id={video_id} 无字幕且未安装 pytubefix/av，跳过音频转录"
+                    )
+                else:
+                    transcript, method = await self._transcribe_via_audio(video_id)
+
+            if transcript:
+                await _cache_put_transcript(video_id, transcript, method)
 
         # ── Layer C: 仅标题 ──────────────────────────────────────────
         if transcript:
@@ -212,9 +257,9 @@ class YouTubeCollector(BaseCollector):
         self, video_id: str
     ) -> tuple[str | None, str | None]:
         """从 YouTube 获取已有字幕文本。"""
+        if YouTubeTranscriptApi is None:
+            return None, None
         try:
-            from youtube_transcript_api import YouTubeTranscriptApi
-
             api = YouTubeTranscriptApi()
             try:
                 tl = api.list(video_id)
@@ -223,24 +268,18 @@ class YouTubeCollector(BaseCollector):
                 return None, None
 
             available = {t.language_code: t for t in tl}
-            preference = ["zh-Hans", "zh-Hant", "zh", "en"]
-            transcript = None
-            for lang in preference:
-                if lang in available:
-                    transcript = available[lang]
-                    break
-            if transcript is None and available:
-                transcript = next(iter(available.values()))
+            transcript = next(
+                (available[lang] for lang in _SUBTITLE_PREFERENCE if lang in available),
+                next(iter(available.values()), None),
+            )
             if transcript is None:
                 return None, None
 
             entries = transcript.fetch()
-            text = " ".join(e.text.strip() for e in entries if e.text.strip())
-            text = re.sub(r"(\[.*?\])\s*(\1\s*)+", r"\1 ", text)
+            parts = [t for t in (e.text.strip() for e in entries) if t]
+            text = _DEDUP_BRACKETS_RE.sub(r"\1", " ".join(parts))
             return text, f"subtitle_{transcript.language_code}"
 
-        except ImportError:
-            return None, None
         except Exception as exc:
             logger.debug(f"[YouTube] 字幕获取失败: {exc}")
             return None, None
@@ -252,41 +291,58 @@ class YouTubeCollector(BaseCollector):
     async def _transcribe_via_audio(
         self, video_id: str
     ) -> tuple[str | None, str | None]:
-        """下载音频并调用 Whisper API 转录。"""
+        """下载音频并调用 Whisper API 转录。
+
+        长音频按 asr_chunk_seconds 切段（逐包复制，不重编码），各段并发转录后按顺序拼接：
+        总耗时约为单段而非整段音频的转录时间，也不再受单文件 24 MB 上传上限约束。
+        """
         from anchor.llm_client import transcribe_audio
 
         tmp_dir = tempfile.mkdtemp(prefix="anchor_yt_")
-        audio_path: str | None = None
         try:
             audio_path = await _download_audio(video_id, tmp_dir)
             if not audio_path:
                 return None, None
 
             size = os.path.getsize(audio_path)
-            if size > _WHISPER_MAX_BYTES:
+            chunk_s = settings.asr_chunk_seconds
+            if chunk_s > 0:
+                loop = asyncio.get_event_loop()
+                chunks = await loop.run_in_executor(
+                    None, _split_audio, audio_path, tmp_dir, chunk_s
+                )
+            else:
+                chunks = [audio_path]
+
+            oversized = [p for p in chunks if os.path.getsize(p) > _WHISPER_MAX_BYTES]
+            if oversized:
                 logger.warning(
-                    f"[YouTube] 音频文件 {size//1024//1024} MB 超过 24 MB 限制，跳过 ASR"
+                    f"[YouTube] {len(oversized)} 段音频超过 24 MB 限制，跳过 ASR"
                 )
                 return None, None
 
             logger.info(
-                f"[YouTube] 音频下载完成 ({size//1024} KB)，开始 Whisper 转录…"
+                f"[YouTube] 音频下载完成 ({size//1024} KB，{len(chunks)} 段)，开始 Whisper 转录…"
             )
-            text = await transcribe_audio(audio_path, language=None)
-            if text:
-                return text, "whisper"
-            return None, None
+            sem = asyncio.Semaphore(max(1, settings.asr_concurrency))
+
+            async def _transcribe(path: str) -> str | None:
+                async with sem:
+                    return await transcribe_audio(path, language=None)
+
+            texts = await asyncio.gather(*(_transcribe(p) for p in chunks))
+            failed = sum(1 for t in texts if not t)
+            if failed == len(texts):
+                return None, None
+            if failed:
+                logger.warning(f"[YouTube] video_id={video_id} {failed}/{len(texts)} 段转录失败")
+            return " ".join(t for t in texts if t), "whisper"
 
         except Exception as exc:
             logger.warning(f"[YouTube] 音频转录失败: {exc}")
             return None, None
         finally:
-            if audio_path and os.path.exists(audio_path):
-                os.remove(audio_path)
-            try:
-                os.rmdir(tmp_dir)
-            except OSError:
-                pass
+            shutil.rmtree(tmp_dir, ignore_errors=True)
 
     # ------------------------------------------------------------------
     # 元数据
@@ -295,53 +351,202 @@ class YouTubeCollector(BaseCollector):
     async def _fetch_metadata(
         self, video_id: str, client: httpx.AsyncClient
     ) -> tuple[str | None, str | None, str | None, int | None, datetime | None]:
-        """返回 (title, author_name, channel_id, duration_s, publish_date)。"""
-        # 先试 pytubefix（最准确，复用内部 API）
-        try:
-            import asyncio
-            from pytubefix import YouTube
+        """返回 (title, author_name, channel_id, duration_s, publish_date)。
+
+        oEmbed（标题/作者，小 JSON）与 watch 页面（频道 ID/时长/发布日期）并发请求；
+        两者都失败才回落 pytubefix（多次 HTTPS 请求 + JS 解析，最慢）。
+        """
+        watch_url = f"https://www.youtube.com/watch?v={video_id}"
+        oembed, page = await asyncio.gather(
+            _fetch_oembed(client, watch_url),
+            _fetch_watch_page(client, watch_url),
+        )
 
-            def _get_info():
-                yt = YouTube(f"https://www.youtube.com/watch?v={video_id}")
-                return yt.title, yt.author, yt.channel_id, yt.length, yt.publish_date
+        if oembed is None and page is None:
+            if not _HAS_PYTUBEFIX:
+                logger.warning(f"[YouTube] 元数据获取失败: video_id={video_id}")
+                return None, None, video_id, None, None
+            try:
+                from pytubefix import YouTube
 
-            loop = asyncio.get_event_loop()
-            title, author, channel_id, length, publish_date = await loop.run_in_executor(None, _get_info)
-            return title, author, channel_id, length, publish_date
-        except Exception:
-            pass
+                def _get_info():
+                    yt = YouTube(watch_url)
+                    return yt.title, yt.author, yt.channel_id, yt.length, yt.publish_date
 
-        # 回落：页面解析
-        try:
-            resp = await client.get(
-                f"https://www.youtube.com/watch?v={video_id}",
-                follow_redirects=True,
-            )
-            html = resp.text
-            title_m  = re.search(r'"title"\s*:\s*"([^"]+)"', html)
-            author_m = re.search(r'"author"\s*:\s*"([^"]+)"', html)
-            cid_m    = re.search(r'"channelId"\s*:\s*"([^"]+)"', html)
-            dur_m    = re.search(r'"lengthSeconds"\s*:\s*"(\d+)"', html)
-            date_m   = re.search(r'"publishDate"\s*:\s*"(\d{4}-\d{2}-\d{2})"', html)
-            title = title_m.group(1) if title_m else None
-            if title:
-                title = title.replace("&amp;", "&").replace("&quot;", '"')
-            publish_date = None
-            if date_m:
-                try:
-                    publish_date = datetime.strptime(date_m.group(1), "%Y-%m-%d")
-                except ValueError:
-                    pass
-            return (
-                title,
-                author_m.group(1) if author_m else None,
-                cid_m.group(1) if cid_m else video_id,
-                int(dur_m.group(1)) if dur_m else None,
-                publish_date,
-            )
-        except Exception as exc:
-            logger.warning(f"[YouTube] 元数据获取失败: {exc}")
-            return None, None, video_id, None, None
+                loop = asyncio.get_event_loop()
+                return await loop.run_in_executor(None, _get_info)
+            except Exception as exc:
+                logger.warning(f"[YouTube] 元数据获取失败: {exc}")
+                return None, None, video_id, None, None
+
+        oembed = oembed or {}
+        page_title, page_author, channel_id, duration_s, publish_date = (
+            page or (None, None, None, None, None)
+        )
+        return (
+            oembed.get("title") or page_title,
+            oembed.get("author_name") or page_author,
+            channel_id or video_id,
+            duration_s,
+            publish_date,
+        )
+
+
+# ---------------------------------------------------------------------------
+# 元数据：oEmbed + watch 页面
+# ---------------------------------------------------------------------------
+
+_PLAYER_JSON_RE = re.compile(r"ytInitialPlayerResponse\s*=\s*(\{.+?\})\s*;\s*(?:var\s|</script>)")
+_TITLE_RE  = re.compile(r'"title"\s*:\s*"([^"]+)"')
+_AUTHOR_RE = re.compile(r'"author"\s*:\s*"([^"]+)"')
+_CID_RE    = re.compile(r'"channelId"\s*:\s*"([^"]+)"')
+_DUR_RE    = re.compile(r'"lengthSeconds"\s*:\s*"(\d+)"')
+_DATE_RE   = re.compile(r'"publishDate"\s*:\s*"(\d{4}-\d{2}-\d{2})"')
+
+
+async def _fetch_oembed(client: httpx.AsyncClient, watch_url: str) -> dict | None:
+    """oEmbed 接口返回 title / author_name；失败返回 None。"""
+    try:
+        resp = await client.get(
+            "https://www.youtube.com/oembed", params={"url": watch_url, "format": "json"}
+        )
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
+    except Exception as exc:
+        logger.debug(f"[YouTube] oEmbed 获取失败: {exc}")
+        return None
+
+
+async def _fetch_watch_page(
+    client: httpx.AsyncClient, watch_url: str
+) -> tuple[str | None, str | None, str | None, int | None, datetime | None] | None:
+    """解析 watch 页面内嵌的播放器数据；失败返回 None。"""
+    try:
+        resp = await client.get(watch_url)
+        resp.raise_for_status()
+    except Exception as exc:
+        logger.debug(f"[YouTube] watch 页面获取失败: {exc}")
+        return None
+
+    html = resp.text
+    parsed = _parse_player_response(html)
+    if parsed is not None:
+        return parsed
+
+    # 回落：页面结构变化、拿不到播放器 JSON 时逐字段正则
+    title_m  = _TITLE_RE.search(html)
+    author_m = _AUTHOR_RE.search(html)
+    cid_m    = _CID_RE.search(html)
+    dur_m    = _DUR_RE.search(html)
+    date_m   = _DATE_RE.search(html)
+    title = title_m.group(1) if title_m else None
+    if title:
+        title = title.replace("&amp;", "&").replace("&quot;", '"')
+    fields = (
+        title,
+        author_m.group(1) if author_m else None,
+        cid_m.group(1) if cid_m else None,
+        int(dur_m.group(1)) if dur_m else None,
+        _parse_publish_date(date_m.group(1) if date_m else None),
+    )
+    # 同意页 / 中间页等不含播放器数据的页面：视为失败，让调用方回落 pytubefix
+    if all(f is None for f in fields):
+        return None
+    return fields
+
+
+def _parse_player_response(
+    html: str,
+) -> tuple[str | None, str | None, str | None, int | None, datetime | None] | None:
+    """从内嵌的 ytInitialPlayerResponse JSON 读取 videoDetails；找不到或解析失败返回 None。
+
+    一次扫描 + 一次 JSON 解析，取代逐字段正则扫描整页；标题等字段也无需再处理 HTML 转义。
+    """
+    m = _PLAYER_JSON_RE.search(html)
+    if not m:
+        return None
+    try:
+        data = orjson.loads(m.group(1))
+    except orjson.JSONDecodeError:
+        return None
+    details = data.get("videoDetails")
+    if not details:
+        return None
+
+    micro = (data.get("microformat") or {}).get("playerMicroformatRenderer") or {}
+    length = details.get("lengthSeconds")
+    return (
+        details.get("title"),
+        details.get("author"),
+        details.get("channelId"),
+        int(length) if length and str(length).isdigit() else None,
+        _parse_publish_date(micro.get("publishDate")),
+    )
+
+
+def _parse_publish_date(raw: str | None) -> datetime | None:
+    """publishDate 形如 "2024-05-01" 或带时间的 ISO 8601，只取日期部分。"""
+    if not raw:
+        return None
+    try:
+        return datetime.strptime(raw[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# 缓存（api_cache 表）：重复采集同一视频时免去元数据请求与字幕抓取 / Whisper 转录
+# ---------------------------------------------------------------------------
+#
+# 元数据（标题、频道等）可能被作者修改，按 youtube_cache_days 过期；
+# 字幕/转录文本对同一视频不变，且 Whisper 转录需重新下载音频并计费，不设过期。
+
+
+def _cache_days(expires: bool) -> float:
+    if settings.youtube_cache_days <= 0:
+        return 0
+    return settings.youtube_cache_days if expires else math.inf
+
+
+async def _cache_get_metadata(
+    video_id: str,
+) -> tuple[str | None, str | None, str | None, int | None, datetime | None] | None:
+    cached = await cache_get(cache_key("youtube", "metadata", video_id), _cache_days(True))
+    if cached is None:
+        return None
+    title, author, channel_id, duration_s, publish_date = cached
+    return (
+        title, author, channel_id, duration_s,
+        datetime.fromisoformat(publish_date) if publish_date else None,
+    )
+
+
+async def _cache_put_metadata(
+    video_id: str,
+    metadata: tuple[str | None, str | None, str | None, int | None, datetime | None],
+) -> None:
+    title, author, channel_id, duration_s, publish_date = metadata
+    await cache_put(
+        cache_key("youtube", "metadata", video_id),
+        [title, author, channel_id, duration_s, publish_date.isoformat() if publish_date else None],
+        _cache_days(True),
+    )
+
+
+async def _cache_get_transcript(video_id: str) -> tuple[str | None, str | None]:
+    cached = await cache_get(cache_key("youtube", "transcript", video_id), _cache_days(False))
+    if cached is None:
+        return None, None
+    logger.debug(f"[YouTube] video_id={video_id} 命中转录缓存（方式={cached['method']}）")
+    return cached["text"], cached["method"]
+
+
+async def _cache_put_transcript(video_id: str, text: str, method: str | None) -> None:
+    await cache_put(
+        cache_key("youtube", "transcript", video_id),
+        {"text": text, "method": method},
+        _cache_days(False),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -351,16 +556,15 @@ class YouTubeCollector(BaseCollector):
 
 async def _download_audio(video_id: str, output_dir: str) -> str | None:
     """
-    用 pytubefix 下载音频并重编码为 16kHz mono m4a。
+    用 pytubefix 下载最低码率的 m4a 音频流，尽量原样交给 Whisper。
 
     流程：
-      1. pytubefix 获取音频专用流并下载（无需 PO Token，直接访问 YouTube 内部 API）
-      2. PyAV 从下载文件中抽取音频轨道 → 重编码为 16kHz mono AAC m4a
-         - 只处理前 YOUTUBE_MAX_DURATION 秒，自然限制 Whisper 消耗
-         - 最终文件通常 < 5 MB（30 分钟内容）
-      3. 删除原始下载文件，只保留处理后的 m4a
+      1. pytubefix 选 audio/mp4 中码率最低的流下载（通常为 itag 139，48 kbps AAC，约 22 MB/小时；
+         无需 PO Token，直接访问 YouTube 内部 API）
+      2. 时长与大小都在限制内 → 直接返回下载文件（Whisper 内部自行降采样到 16kHz，重编码是白费的 CPU）
+      3. 超过 YOUTUBE_MAX_DURATION → PyAV 逐包复制前 YOUTUBE_MAX_DURATION 秒（不解码、不重编码）
+      4. 不切段转录（ASR_CHUNK_SECONDS=0）且截断后仍超过 Whisper 上传上限 → 回落 PyAV 重编码为 16kHz mono AAC m4a
     """
-    import asyncio
 
     def _run() -> str | None:
         max_dur  = settings.youtube_max_duration
@@ -371,7 +575,10 @@ async def _download_audio(video_id: str, output_dir: str) -> str | None:
             from pytubefix import YouTube
 
             yt     = YouTube(f"https://www.youtube.com/watch?v={video_id}")
-            stream = yt.streams.get_audio_only()
+            stream = (
+                yt.streams.filter(only_audio=True, mime_type="audio/mp4").order_by("abr").asc().first()
+                or yt.streams.get_audio_only()
+            )
             if not stream:
                 logger.warning(f"[YouTube] pytubefix: 无音频流")
                 return None
@@ -380,52 +587,34 @@ async def _download_audio(video_id: str, output_dir: str) -> str | None:
                 output_path=output_dir,
                 filename=f"{video_id}_raw.m4a",
             )
+            length = yt.length or 0
             sz = os.path.getsize(raw_path)
-            logger.info(f"[YouTube] pytubefix 下载完成: {sz//1024} KB")
+            logger.info(f"[YouTube] pytubefix 下载完成: {sz//1024} KB（itag={stream.itag}）")
         except Exception as exc:
             logger.warning(f"[YouTube] pytubefix 下载失败: {exc}")
             return None
 
-        # ── Step 2: PyAV 重编码 → 16kHz mono m4a ─────────────────────
+        # ── Step 2: 按时长/大小决定直接使用、复制截断或重编码 ─────────
+        # 时长未知时无法判断是否超限，按需截断处理（复制截断很便宜）
+        need_trim = max_dur > 0 and (not length or length > max_dur)
+        est_size = sz * max_dur / length if need_trim and length else sz
         out_path = os.path.join(output_dir, f"{video_id}.m4a")
         try:
-            import av
-
-            with av.open(raw_path) as in_c:
-                audio_streams = [s for s in in_c.streams if s.type == "audio"]
-                if not audio_streams:
-                    logger.warning("[YouTube] 下载文件中无音频轨道")
-                    return None
-                astream = audio_streams[0]
-
-                logger.info(
-                    f"[YouTube] 开始重编码音频"
-                    f"（codec={astream.codec_context.name}"
-                    f" sr={astream.sample_rate}"
-                    f" 最长={max_dur}s）"
-                )
-
-                with av.open(out_path, mode="w", format="ipod") as out_c:
-                    ostream = out_c.add_stream("aac", rate=16000)
-                    ostream.layout = "mono"
-
-                    for frame in in_c.decode(astream):
-                        if max_dur > 0 and frame.time and frame.time > max_dur:
-                            logger.debug(f"[YouTube] 达到时长限制 {max_dur}s，截断")
-                            break
-                        frame.pts = None
-                        for pkt in ostream.encode(frame):
-                            out_c.mux(pkt)
-
-                    for pkt in ostream.encode():
-                        out_c.mux(pkt)
+            # 切段转录时每段都远小于上传上限，无需为整体大小重编码
+            if est_size > _WHISPER_MAX_BYTES and settings.asr_chunk_seconds <= 0:
+                _reencode_audio(raw_path, out_path, max_dur)
+            elif need_trim:
+                _trim_audio_copy(raw_path, out_path, max_dur)
+            else:
+                path, raw_path = raw_path, None   # 原样使用，不在 finally 中删除
+                return path
 
             sz = os.path.getsize(out_path)
-            logger.info(f"[YouTube] 重编码完成: {sz//1024} KB → {out_path}")
+            logger.info(f"[YouTube] 音频处理完成: {sz//1024} KB → {out_path}")
             return out_path
 
         except Exception as exc:
-            logger.warning(f"[YouTube] PyAV 重编码失败: {exc}")
+            logger.warning(f"[YouTube] PyAV 处理失败: {exc}")
             if os.path.exists(out_path):
                 os.remove(out_path)
             return None
@@ -436,3 +625,106 @@ async def _download_audio(video_id: str, output_dir: str) -> str | None:
 
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(None, _run)
+
+
+def _first_audio_stream(container):
+    astream = next((s for s in container.streams if s.type == "audio"), None)
+    if astream is None:
+        raise ValueError("下载文件中无音频轨道")
+    return astream
+
+
+def _copy_stream(out_c, astream):
+    # PyAV 13+ 为 add_stream_from_template；12 为 add_stream(template=...)
+    from_template = getattr(out_c, "add_stream_from_template", None)
+    return from_template(astream) if from_template else out_c.add_stream(template=astream)
+
+
+def _trim_audio_copy(src: str, dst: str, max_dur: int) -> None:
+    """逐包复制前 max_dur 秒音频（stream copy，不解码不重编码）。"""
+    import av
+
+    with av.open(src) as in_c:
+        astream = _first_audio_stream(in_c)
+        with av.open(dst, mode="w", format="ipod") as out_c:
+            ostream = _copy_stream(out_c, astream)
+            for pkt in in_c.demux(astream):
+                if pkt.dts is None:          # demux 结尾的空包
+                    continue
+                if pkt.time is not None and pkt.time > max_dur:
+                    logger.debug(f"[YouTube] 达到时长限制 {max_dur}s，截断")
+                    break
+                pkt.stream = ostream
+                out_c.mux(pkt)
+
+
+def _split_audio(src: str, output_dir: str, chunk_s: int) -> list[str]:
+    """按 chunk_s 秒把音频逐包复制切成多段 m4a（不重编码），按时间顺序返回路径。
+
+    切点落在 chunk_s 整数倍之后的第一个包上；总时长不超过 chunk_s 时原样返回 [src]。
+    """
+    import av
+
+    paths: list[str] = []
+    with av.open(src) as in_c:
+        astream = _first_audio_stream(in_c)
+        if in_c.duration is not None and in_c.duration / av.time_base <= chunk_s:
+            return [src]
+
+        out_c = ostream = None
+        start_dts = 0
+        seg_end = 0.0
+        try:
+            for pkt in in_c.demux(astream):
+                if pkt.dts is None:          # demux 结尾的空包
+                    continue
+                t = float(pkt.dts * pkt.time_base)
+                if out_c is None or t >= seg_end:
+                    if out_c is not None:
+                        out_c.close()
+                    path = os.path.join(output_dir, f"chunk_{len(paths):03d}.m4a")
+                    out_c = av.open(path, mode="w", format="ipod")
+                    ostream = _copy_stream(out_c, astream)
+                    paths.append(path)
+                    start_dts = pkt.dts
+                    seg_end = (t // chunk_s + 1) * chunk_s
+                # 每段时间戳从 0 开始
+                pkt.dts -= start_dts
+                if pkt.pts is not None:
+                    pkt.pts -= start_dts
+                pkt.stream = ostream
+                out_c.mux(pkt)
+        finally:
+            if out_c is not None:
+                out_c.close()
+
+    return paths or [src]
+
+
+def _reencode_audio(src: str, dst: str, max_dur: int) -> None:
+    """解码并重编码为 16kHz mono AAC m4a（仅处理前 max_dur 秒；0 = 不限制）。"""
+    import av
+
+    with av.open(src) as in_c:
+        astream = _first_audio_stream(in_c)
+        logger.info(
+            f"[YouTube] 开始重编码音频"
+            f"（codec={astream.codec_context.name}"
+            f" sr={astream.sample_rate}"
+            f" 最长={max_dur}s）"
+        )
+
+        with av.open(dst, mode="w", format="ipod") as out_c:
+            ostream = out_c.add_stream("aac", rate=16000)
+            ostream.layout = "mono"
+
+            for frame in in_c.decode(astream):
+                if max_dur > 0 and frame.time and frame.time > max_dur:
+                    logger.debug(f"[YouTube] 达到时长限制 {max_dur}s，截断")
+                    break
+                frame.pts = None
+                for pkt in ostream.encode(frame):
+                    out_c.mux(pkt)
+
+            for pkt in ostream.encode():
+                out_c.mux(pkt)
@@ -539,15 +539,17 @@ def monitor_command(
     force: bool = False,
 ) -> None:
     """CLI 入口，由 anchor.cli 调用。"""
+    from anchor.collect._http import closing_shared_clients
+
     since_dt: Optional[datetime] = None
     if since:
         since_dt = datetime.strptime(since, "%Y-%m-%d").replace(tzinfo=timezone.utc)
 
-    asyncio.run(_main(
+    asyncio.run(closing_shared_clients(_main(
         dry_run=dry_run,
         source=source,
         limit=limit,
         concurrency=concurrency,
         since=since_dt,
         force=force,
-    ))
+    )))
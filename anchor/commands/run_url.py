@@ -335,11 +335,13 @@ async def _main_local(path: Path) -> None:
 
 def run_url_command(target: str, force: bool = False) -> None:
     """CLI 入口，由 anchor.cli 调用。"""
+    from anchor.collect._http import closing_shared_clients
+
     arg = target
     if arg.startswith("file://"):
         arg = arg[len("file://"):]
     p = Path(arg)
     if p.exists():
-        asyncio.run(_main_local(p))
+        asyncio.run(closing_shared_clients(_main_local(p)))
     else:
-        asyncio.run(_main_url(arg))
+        asyncio.run(closing_shared_clients(_main_url(arg)))
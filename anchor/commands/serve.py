@@ -4,8 +4,12 @@ anchor.commands.serve — Web UI 启动
 from __future__ import annotations
 
 
-def serve_command(host: str = "0.0.0.0", port: int = 8765) -> None:
-    """CLI 入口，由 anchor.cli 调用。"""
+def serve_command(host: str = "0.0.0.0", port: int = 8765, workers: int = 1) -> None:
+    """CLI 入口，由 anchor.cli 调用。
+
+    loop/http 为 auto：uvicorn[standard] 已安装 uvloop + httptools 时自动选用，
+    不支持的平台（如 Windows）退回 asyncio + h11。workers > 1 时以多进程运行（进程内缓存不共享）。
+    """
     import uvicorn
 
     uvicorn.run(
@@ -13,4 +17,7 @@ def serve_command(host: str = "0.0.0.0", port: int = 8765) -> None:
         host=host,
         port=port,
         reload=False,
+        workers=workers,
+        loop="auto",
+        http="auto",
     )
@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     llm_model: str = ""
     # 视觉模型（图片描述用）：不填则复用 llm_model；OpenAI 模式下通常需填 qwen-vl-plus 等
     llm_vision_model: str = ""
+    # 单帖多图时同时进行的视觉模型调用数
+    media_concurrency: int = 4
 
     # Twitter/X
     twitter_bearer_token: str = ""
@@ -49,6 +51,9 @@ class Settings(BaseSettings):
     # RSS — 空则使用内置列表
     rss_feeds: str = ""
 
+    # 上下文补全的平台 API 响应缓存天数（api_cache 表）；0 = 不缓存
+    context_cache_days: int = 7
+
     # ── Embedding（节点归一化预筛用）──────────────────────────────────────────
     # 使用 OpenAI 兼容 embedding API；不填则复用 llm_api_key / llm_base_url
     # Anthropic 无 embedding API，需单独配置 OpenAI 兼容端点（如 DashScope）
@@ -56,6 +61,17 @@ class Settings(BaseSettings):
     embedding_base_url: str = ""
     embedding_model: str = "text-embedding-v3"  # DashScope 默认；OpenAI 用 text-embedding-3-small
 
+    # ── LLM 响应缓存（提取管线）────────────────────────────────────────────
+    # 精确匹配：sha256(模型 + system + user) → 响应，持久化到 llm_cache 表
+    llm_exact_cache: bool = False
+    # 语义缓存：按 user 消息 embedding 查缓存，余弦相似度 ≥ 阈值直接复用响应
+    # 依赖上方 embedding 配置；财报类内容数字敏感，阈值宜保守
+    llm_semantic_cache: bool = False
+    llm_semantic_cache_threshold: float = 0.97
+    llm_semantic_cache_size: int = 2048
+    # Anthropic prompt caching：system 提示词标记为可缓存前缀（OpenAI 兼容端点按前缀自动缓存，无需配置）
+    llm_prompt_cache: bool = True
+
     # ── 语音转录（YouTube 音频 → 文字）──────────────────────────────────────
     # 使用 OpenAI Whisper 兼容 API；不填则复用 llm_api_key
     asr_api_key: str = ""
@@ -63,6 +79,13 @@ class Settings(BaseSettings):
     asr_model: str = "whisper-1"    # Groq 用 "whisper-large-v3-turbo"
     # YouTube 最大转录时长（秒），超出则截断；0 = 不限制；默认 30 分钟
     youtube_max_duration: int = 1800
+    # 长音频切段转录：每段秒数（逐包复制切分，不重编码）与同时进行的转录请求数；0 = 不切分
+    asr_chunk_seconds: int = 300
+    asr_concurrency: int = 6
+    # 批量采集时同时处理的视频数（元数据 + 字幕 + 转录），过高易触发 YouTube 限流
+    youtube_concurrency: int = 4
+    # YouTube 元数据缓存天数（api_cache 表）；字幕/转录文本不过期；0 = 不缓存
+    youtube_cache_days: int = 30
 
     # ── 多模型交叉验证（Layer3 验证方案设计用）──────────────────────────────────
     # 逗号分隔的模型 ID 列表，同一 provider 下不同模型（与 llm_provider 相同）
@@ -107,6 +130,13 @@ class Settings(BaseSettings):
         """检查某域是否启用。未注册的域默认禁用。"""
         return self.enabled_domains.get(domain, False)
 
+    # Extractor.extract_many 的 LLM 并发上限
+    extract_max_concurrency: int = 20
+    # 级联提取：填写后先用该（便宜）模型提取，结果置信度低时再用主模型重跑；空 = 直接用主模型
+    extract_cheap_model: str = ""
+    # 正文超过该字符数直接用主模型（长文便宜模型几乎必然升级重跑）；0 = 全部直接用主模型
+    extract_cheap_max_chars: int = 20000
+
     # ── Batch 模式（Qwen/OpenAI 兼容端点 50% 成本优化）────────────────────
     # 开启后 LLM 调用走 OpenAI Batch API，异步提交 + 轮询获取结果
     # 仅 llm_provider=openai 时生效；Anthropic 模式自动忽略
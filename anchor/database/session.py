@@ -3,7 +3,8 @@ from collections.abc import AsyncGenerator
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy import event
+from loguru import logger
+from sqlalchemy import delete, event, func, inspect, select, update
 
 from anchor.config import settings
 
@@ -37,9 +38,86 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+# 后加的唯一索引：create_all 不会给已存在的表补索引，需在启动时单独补建
+_UNIQUE_INDEXES: list[tuple[str, str]] = [
+    ("raw_posts", "ix_raw_posts_source_external_id"),
+    ("authors", "ix_authors_platform_platform_id"),
+]
+
+
+def _repoint_references(conn, table, remap: dict[int, int]) -> None:
+    """把所有引用 table.id 的外键从重复行改指向保留行。
+
+    外键列带唯一约束时（如一帖一条评估），保留行已有记录则直接删除重复行的记录。
+    """
+    existing = set(inspect(conn).get_table_names())
+    for child in SQLModel.metadata.sorted_tables:
+        if child.name not in existing:
+            continue
+        for fk in child.foreign_keys:
+            if fk.column.table is not table:
+                continue
+            col = fk.parent
+            for dup_id, keep_id in remap.items():
+                if col.unique and conn.execute(
+                    select(func.count()).select_from(child).where(col == keep_id)
+                ).scalar():
+                    conn.execute(delete(child).where(col == dup_id))
+                else:
+                    conn.execute(
+                        update(child).where(col == dup_id).values({col.name: keep_id})
+                    )
+
+
+def _ensure_unique_index(conn, table_name: str, index_name: str) -> None:
+    """已有库缺唯一索引时补建：先合并重复行（保留 MIN(id)），再建索引。"""
+    insp = inspect(conn)
+    if table_name not in insp.get_table_names():
+        return
+    if any(ix["name"] == index_name for ix in insp.get_indexes(table_name)):
+        return
+
+    table = SQLModel.metadata.tables[table_name]
+    index = next(ix for ix in table.indexes if ix.name == index_name)
+    cols = list(index.columns)
+
+    # NULL 不参与唯一约束冲突，不需要合并
+    groups = conn.execute(
+        select(*cols, func.min(table.c.id))
+        .where(*(c.isnot(None) for c in cols))
+        .group_by(*cols)
+        .having(func.count() > 1)
+    ).all()
+    remap: dict[int, int] = {}
+    for *key, keep_id in groups:
+        dup_ids = conn.execute(
+            select(table.c.id)
+            .where(*(c == v for c, v in zip(cols, key)))
+            .where(table.c.id != keep_id)
+        ).scalars()
+        remap.update((dup_id, keep_id) for dup_id in dup_ids)
+
+    if remap:
+        logger.warning(
+            f"[DB] {table_name} 有 {len(remap)} 条重复行（{len(groups)} 组），"
+            f"引用改指向 MIN(id) 后删除"
+        )
+        _repoint_references(conn, table, remap)
+        conn.execute(delete(table).where(table.c.id.in_(list(remap))))
+
+    index.create(conn)
+    logger.info(f"[DB] 已补建唯一索引 {index_name}")
+
+
+def _ensure_unique_indexes(conn) -> None:
+    for table_name, index_name in _UNIQUE_INDEXES:
+        _ensure_unique_index(conn, table_name, index_name)
+
+
 async def create_tables() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(_ensure_unique_indexes)
 
 
 if __name__ == "__main__":
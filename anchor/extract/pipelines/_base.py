@@ -6,20 +6,84 @@ LLM 调用封装、JSON 解析等纯工具函数。
 
 from __future__ import annotations
 
-import json
-import re
-from typing import Optional
+from typing import Callable, Optional
 
 from loguru import logger
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from anchor.llm_client import batch_chat_completions, chat_completion
+from anchor.config import settings
+from anchor.llm_client import batch_chat_completions, chat_completion, extract_json_text
 from anchor.models import Author, RawPost
 
 
-async def call_llm(system: str, user: str, max_tokens: int) -> str | None:
-    resp = await chat_completion(system=system, user=user, max_tokens=max_tokens)
+async def call_llm(
+    system: str, user: str, max_tokens: int, stream: bool = False,
+    model: str | None = None, json_schema: dict | None = None,
+    accept: Callable[[str], bool] | None = None,
+) -> str | None:
+    """提取管线 LLM 调用：精确匹配缓存 → 语义缓存 → 实时调用。
+
+    stream=True 时实时调用走流式传输（长输出推荐）；model 覆盖默认主模型；
+    json_schema 非空时要求模型直接输出 JSON 对象（见 chat_completion）。
+    accept 非空时实时输出须通过 accept 才返回并写入缓存，否则返回 None，
+    截断或非法的输出不会被缓存下来反复命中。
+    """
+    key = None
+    if settings.llm_exact_cache:
+        from anchor.llm_cache import exact_get, exact_key
+        key = exact_key(system, user, model, max_tokens=max_tokens, json_schema=json_schema)
+        cached = await exact_get(key)
+        if cached is not None:
+            return cached
+
+    async def _call() -> str | None:
+        content = await _call_llm_uncached(system, user, max_tokens, stream, model, json_schema)
+        if content is None or (accept is not None and not accept(content)):
+            return None
+        # 只缓存真实调用的结果：语义缓存的近似命中若写入精确缓存，会把别的帖子的输出永久绑定到本帖
+        if key is not None:
+            from anchor.llm_cache import exact_put
+            await exact_put(key, content, model)
+        return content
+
+    if settings.llm_semantic_cache:
+        from anchor.llm_cache import semantic_cache
+        return await semantic_cache.get_or_call(system, user, _call, model=model)
+    return await _call()
+
+
+async def call_llm_json(
+    system: str, user: str, max_tokens: int, model_cls, step_name: str,
+    stream: bool = False, model: str | None = None, json_schema: dict | None = None,
+):
+    """call_llm + parse_json：只有解析成功的输出才写入缓存，失败返回 None。"""
+    parsed = None
+
+    def _accept(content: str) -> bool:
+        nonlocal parsed
+        parsed = parse_json(content, model_cls, step_name)
+        return parsed is not None
+
+    raw = await call_llm(
+        system, user, max_tokens, stream=stream, model=model,
+        json_schema=json_schema, accept=_accept,
+    )
+    if raw is None:
+        return None
+    if parsed is None:  # 缓存命中，未经过 _accept
+        parsed = parse_json(raw, model_cls, step_name)
+    return parsed
+
+
+async def _call_llm_uncached(
+    system: str, user: str, max_tokens: int, stream: bool = False,
+    model: str | None = None, json_schema: dict | None = None,
+) -> str | None:
+    resp = await chat_completion(
+        system=system, user=user, max_tokens=max_tokens, model=model, stream=stream,
+        json_schema=json_schema,
+    )
     if resp is None:
         return None
     logger.debug(f"LLM: model={resp.model} in={resp.input_tokens} out={resp.output_tokens}")
@@ -50,20 +114,14 @@ async def call_llm_batch(
 
 def parse_json(raw: str, model_cls, step_name: str):
     """从 LLM 返回文本中提取 JSON 并解析为给定 Pydantic 模型。"""
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", raw, re.DOTALL)
-    json_str = match.group(1) if match else raw.strip()
-
-    if not match:
-        start = json_str.find("{")
-        end = json_str.rfind("}") + 1
-        if start == -1 or end == 0:
-            logger.warning(f"{step_name}: no JSON found in output")
-            return None
-        json_str = json_str[start:end]
+    json_str = extract_json_text(raw)
+    if json_str is None:
+        logger.warning(f"{step_name}: no JSON found in output")
+        return None
 
     try:
-        data = json.loads(json_str)
-        return model_cls.model_validate(data)
+        # 直接从 JSON 文本校验：pydantic-core 一趟完成解析 + 校验，不经中间 dict
+        return model_cls.model_validate_json(json_str)
     except Exception as exc:
         logger.warning(f"{step_name} parse error: {exc}\nRaw: {raw[:400]}")
         return None
@@ -11,15 +11,18 @@ pipelines/company.py — Company 专用提取管线
 
 from __future__ import annotations
 
+import functools
 import json
 from dataclasses import dataclass, field
 from datetime import date as _date
 
 from loguru import logger
+from sqlalchemy import insert
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from anchor.extract.pipelines._base import call_llm, parse_json, safe_float, safe_str
+from anchor.config import settings
+from anchor.extract.pipelines._base import call_llm_json, safe_float, safe_str
 from anchor.extract.schemas.company import CompanyExtractionResult
 from anchor.models import (
     AuditOpinion,
@@ -49,6 +52,10 @@ from anchor.models import (
 )
 
 _MAX_TOKENS = 16384
+# 结构化输出约束：模型直接输出 JSON 对象，省去围栏与说明文字的输出 token
+_OUTPUT_SCHEMA = CompanyExtractionResult.model_json_schema()
+# 级联提取：便宜模型结果为空时，正文超过此长度才值得升级主模型重跑
+_ESCALATE_MIN_CHARS = 2000
 
 # ── LLM 提示词 ──────────────────────────────────────────────────────────
 
@@ -372,10 +379,18 @@ def _build_user_message(content: str, platform: str, author: str, today: str) ->
 # ── Helper ───────────────────────────────────────────────────────────────
 
 
-def _parse_date(s: str | None) -> _date | None:
+def _parse_date(s) -> _date | None:
+    """LLM 日期字段 → date。LLM 可能给出列表、字典等任意 JSON 值，先归一为 str 再走缓存。"""
+    if not s:
+        return None
+    return _parse_date_str(str(s).strip())
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_str(s: str) -> _date | None:
+    """纯函数，到期日/生效日等在同一公司多期财报间大量重复，缓存结果。"""
     if not s or s == "null":
         return None
-    s = str(s).strip()
     try:
         if len(s) == 4:
             return _date(int(s), 1, 1)
@@ -384,6 +399,9 @@ def _parse_date(s: str | None) -> _date | None:
         return None
 
 
+_company_id_cache: dict[str, int] = {}
+
+
 async def get_or_create_company(
     session: AsyncSession,
     company_data: dict | None,
@@ -396,11 +414,21 @@ async def get_or_create_company(
     if not ticker:
         return None
 
+    # 进程内 ticker → id 缓存：命中走主键查找（同 session 内直接命中 identity map）。
+    # 命中后仍核对 ticker：缓存的行可能随事务回滚消失，SQLite 会把该 id 重新分给别的公司
+    cached_id = _company_id_cache.get(ticker)
+    if cached_id is not None:
+        cached = await session.get(CompanyProfile, cached_id)
+        if cached is not None and cached.ticker == ticker:
+            return cached
+        _company_id_cache.pop(ticker, None)
+
     result = await session.exec(
         select(CompanyProfile).where(CompanyProfile.ticker == ticker)
     )
     existing = result.first()
     if existing:
+        _company_id_cache[ticker] = existing.id
         return existing
 
     company = CompanyProfile(
@@ -412,9 +440,27 @@ async def get_or_create_company(
     )
     session.add(company)
     await session.flush()
+    # 新建行尚未提交，不写缓存（下次查询命中已提交的行后再缓存）
     return company
 
 
+async def resolve_company_ids(
+    session: AsyncSession,
+    names: set[str],
+) -> dict[str, int]:
+    """按公司名一次性批量查找已有 CompanyProfile id（单条 IN 查询）。
+
+    仅查找不创建：竞对等引用只有名称、没有 ticker，无法建档。
+    """
+    names = {n for n in names if n}
+    if not names:
+        return {}
+    result = await session.exec(
+        select(CompanyProfile.name, CompanyProfile.id).where(CompanyProfile.name.in_(names))
+    )
+    return {name: cid for name, cid in result.all()}
+
+
 # ── Compute 阶段（纯 LLM，无 DB）────────────────────────────────────────
 
 
@@ -432,18 +478,49 @@ async def extract_company_compute(
     author: str,
     today: str,
 ) -> CompanyComputeResult:
-    """纯 LLM 计算阶段：提取 company 域全量结构化数据。"""
-    result = CompanyComputeResult()
+    """纯 LLM 计算阶段：提取 company 域全量结构化数据。
 
+    配置了 extract_cheap_model 时走两级级联：先用便宜模型提取，
+    仅当结果置信度低（见 _needs_escalation）时再用主模型重跑。
+    超过 extract_cheap_max_chars 的长文（完整年报/10-K 等）便宜模型大概率漏提，
+    直接交给主模型，省掉一次注定升级的调用。
+    """
     user_msg = _build_user_message(content, platform, author, today)
-    raw = await call_llm(SYSTEM_COMPANY, user_msg, _MAX_TOKENS)
-    if raw is None:
-        logger.warning("[Company] LLM returned None")
-        return result
 
-    parsed = parse_json(raw, CompanyExtractionResult, "company_extract")
+    cheap_model = settings.extract_cheap_model
+    if cheap_model and len(content) <= settings.extract_cheap_max_chars:
+        result = await _compute_once(user_msg, model=cheap_model)
+        if not _needs_escalation(result, content):
+            return result
+        logger.info(f"[Company] Cheap model {cheap_model} low-confidence, escalating to main model")
+
+    return await _compute_once(user_msg)
+
+
+def _needs_escalation(result: CompanyComputeResult, content: str) -> bool:
+    """便宜模型结果是否需要升级到主模型重跑。
+
+    - 调用失败或 JSON 解析失败（无 skip_reason 的不相关结果）
+    - 判定相关，但长文中既无财务科目也无经营议题（大概率漏提）
+    """
+    if not result.is_relevant:
+        return result.skip_reason is None
+    data = result.data
+    fs = data.financial_statements
+    has_fin = bool(fs and (fs.income or fs.balance_sheet or fs.cashflow))
+    return not has_fin and not data.operational_issues and len(content) > _ESCALATE_MIN_CHARS
+
+
+async def _compute_once(user_msg: str, model: str | None = None) -> CompanyComputeResult:
+    result = CompanyComputeResult()
+
+    # 16k token 长输出：流式接收，避免长时间无数据导致网关空闲超时
+    parsed = await call_llm_json(
+        SYSTEM_COMPANY, user_msg, _MAX_TOKENS, CompanyExtractionResult, "company_extract",
+        stream=True, model=model, json_schema=_OUTPUT_SCHEMA,
+    )
     if parsed is None:
-        logger.warning("[Company] Parse failed")
+        logger.warning("[Company] LLM returned no valid result")
         return result
 
     if not parsed.is_relevant_content:
@@ -476,7 +553,6 @@ async def extract_company_write(
     if not compute_result.is_relevant or compute_result.data is None:
         raw_post.is_processed = True
         raw_post.processed_at = _utcnow()
-        session.add(raw_post)
         await session.flush()
         return {
             "is_relevant_content": False,
@@ -494,7 +570,6 @@ async def extract_company_write(
         logger.warning("[Company] Cannot identify company, skipping DB write")
         raw_post.is_processed = True
         raw_post.processed_at = _utcnow()
-        session.add(raw_post)
         await session.flush()
         return {
             "is_relevant_content": False,
@@ -513,6 +588,8 @@ async def extract_company_write(
         currency = fs.currency or "USD"
         period_type = "quarterly" if "Q" in period else "annual"
 
+        # 三张报表一次 flush 拿到全部 id（SQLAlchemy 2.0 合并为单条 INSERT ... RETURNING）
+        statements: list[tuple[FinancialStatement, list]] = []
         for stmt_type, items in [
             ("income", fs.income),
             ("balance_sheet", fs.balance_sheet),
@@ -520,7 +597,7 @@ async def extract_company_write(
         ]:
             if not items:
                 continue
-            stmt = FinancialStatement(
+            statements.append((FinancialStatement(
                 company_id=company_id,
                 period=period,
                 period_type=period_type,
@@ -528,23 +605,30 @@ async def extract_company_write(
                 currency=currency,
                 reported_at=raw_post.posted_at.date() if raw_post.posted_at else None,
                 raw_post_id=raw_post.id,
-            )
-            session.add(stmt)
+            ), items))
+
+        if statements:
+            session.add_all([stmt for stmt, _ in statements])
             await session.flush()
 
+        # 科目明细一次 executemany 写入：一份年报上百行，跳过逐行 ORM 对象构造与 identity map 登记
+        line_rows = []
+        for stmt, items in statements:
             for ordinal, item in enumerate(items, 1):
                 val = safe_float(item.value)
                 if val is None:
                     continue
-                session.add(FinancialLineItem(
-                    statement_id=stmt.id,
-                    item_key=item.item_key,
-                    item_label=item.item_label,
-                    value=val,
-                    ordinal=ordinal,
-                    note=item.note,
-                ))
-                fin_item_count += 1
+                line_rows.append({
+                    "statement_id": stmt.id,
+                    "item_key": item.item_key,
+                    "item_label": item.item_label,
+                    "value": val,
+                    "ordinal": ordinal,
+                    "note": item.note,
+                })
+        if line_rows:
+            await session.execute(insert(FinancialLineItem), line_rows)
+        fin_item_count = len(line_rows)
     counts["financial_line_items"] = fin_item_count
 
     # ── Operational Issues ──────────────────────────────────────────────
@@ -754,10 +838,14 @@ async def extract_company_write(
     counts["pricing_actions"] = len(data.pricing_actions)
 
     # ── Competitor Relations ─────────────────────────────────────────
+    competitor_ids = await resolve_company_ids(
+        session, {item.competitor_name for item in data.competitor_relations},
+    )
     for item in data.competitor_relations:
         session.add(CompetitorRelation(
             company_id=company_id,
             competitor_name=item.competitor_name,
+            competitor_company_id=competitor_ids.get(item.competitor_name),
             market_segment=item.market_segment,
             relationship_type=item.relationship_type,
             raw_post_id=raw_post.id,
@@ -849,7 +937,6 @@ async def extract_company_write(
     raw_post.processed_at = _utcnow()
     if data.summary:
         raw_post.content_summary = data.summary
-    session.add(raw_post)
     await session.commit()
 
     total = sum(counts.values())
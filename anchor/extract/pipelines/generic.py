@@ -176,8 +176,6 @@ async def _call1_single(
     author: str,
     today: str,
     valid_types: set[str],
-    call_llm,
-    parse_json,
     id_offset: int = 0,
     existing_themes: list[str] | None = None,
 ) -> list[ExtractedNode]:
@@ -194,14 +192,13 @@ async def _call1_single(
             f"只有出现全新主题时才创建新的主旨节点。"
         )
 
-    raw1 = await call_llm(prompt_module.SYSTEM_CALL1, user1, _CALL1_TOKENS)
-    if raw1 is None:
-        logger.warning("[Generic] Call 1 chunk LLM returned None")
-        return []
+    from anchor.extract.pipelines._base import call_llm_json
 
-    result1 = parse_json(raw1, NodeExtractionResult, "generic_call1")
+    result1 = await call_llm_json(
+        prompt_module.SYSTEM_CALL1, user1, _CALL1_TOKENS, NodeExtractionResult, "generic_call1",
+    )
     if result1 is None:
-        logger.warning("[Generic] Call 1 chunk parse failed")
+        logger.warning("[Generic] Call 1 chunk LLM returned no valid result")
         return []
 
     if not result1.is_relevant_content:
@@ -401,8 +398,7 @@ async def extract_generic_compute(
         )
     else:
         valid_nodes = await _call1_single(
-            prompt_module, content, platform, author, today,
-            valid_types, call_llm, parse_json,
+            prompt_module, content, platform, author, today, valid_types,
         )
 
     if chunks and valid_nodes:
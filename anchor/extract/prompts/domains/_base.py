@@ -6,7 +6,7 @@
 
 from __future__ import annotations
 
-import json
+import functools
 
 
 def build_system_call1(domain: str, node_type_descriptions: dict[str, str]) -> str:
@@ -98,26 +98,11 @@ def build_system_call2(domain: str) -> str:
 """
 
 
-def build_user_message_call1(
-    content: str,
-    platform: str,
-    author: str,
-    today: str,
-    domain: str,
-    node_type_names: list[str],
-) -> str:
-    """构建 Call 1 user message。"""
+@functools.lru_cache(maxsize=None)
+def _call1_task_block(domain: str, node_type_names: tuple[str, ...]) -> str:
+    """Call 1 user message 的静态尾部（任务说明 + JSON 骨架），每个领域只构建一次。"""
     types_str = "、".join(node_type_names)
     return f"""\
-## 文章信息
-平台：{platform}
-作者：{author}
-日期：{today}
-
-## 文章内容
-
-{content[:25000]}{"..." if len(content) > 25000 else ""}
-
 ## 提取任务
 
 请从上述文章中提取「{domain}」领域的节点。
@@ -145,6 +130,28 @@ def build_user_message_call1(
 """
 
 
+def build_user_message_call1(
+    content: str,
+    platform: str,
+    author: str,
+    today: str,
+    domain: str,
+    node_type_names: list[str],
+) -> str:
+    """构建 Call 1 user message。"""
+    return f"""\
+## 文章信息
+平台：{platform}
+作者：{author}
+日期：{today}
+
+## 文章内容
+
+{content[:25000]}{"..." if len(content) > 25000 else ""}
+
+{_call1_task_block(domain, tuple(node_type_names))}"""
+
+
 def build_user_message_call2(
     content: str,
     nodes_json: str,
@@ -159,6 +166,11 @@ def build_user_message_call2(
 
 {nodes_json}
 
+{_CALL2_TASK_BLOCK}"""
+
+
+# Call 2 user message 的静态尾部（任务说明 + JSON 骨架）
+_CALL2_TASK_BLOCK = """\
 ## 分析任务
 
 1. 发现上述节点之间的关系（边）
@@ -167,17 +179,17 @@ def build_user_message_call2(
 
 输出格式：
 ```json
-{{
+{
   "edges": [
-    {{
+    {
       "source_id": "n0",
       "target_id": "n1",
       "edge_type": "causes|produces|derives|supports|contradicts|implements|constrains|amplifies|mitigates|resolves|measures|competes",
       "note": "≤80字说明"
-    }}
+    }
   ],
   "summary": "≤200字叙事摘要",
   "one_liner": "≤50字一句话总结"
-}}
+}
 ```\
 """
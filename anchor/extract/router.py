@@ -6,10 +6,12 @@ company 域走专用提取管线（13 张表），其他域暂时禁用。
 Usage:
     extractor = Extractor()
     result = await extractor.extract(raw_post, session, content_mode="company")
+    results = await extractor.extract_many(raw_posts, session, content_mode="company")
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime
 
 from loguru import logger
@@ -42,6 +44,89 @@ class Extractor:
             author_intent: 通用判断前置分类的作者意图
             force:         True 时跳过 is_processed 检查
         """
+        prepared = await self._prepare(raw_post, content_mode, force)
+        if not isinstance(prepared, tuple):
+            return prepared
+        content, platform, author, today = prepared
+
+        logger.info(f"[Extractor] Extracting RawPost id={raw_post.id} domain={content_mode}")
+
+        # ── 域路由 ─────────────────────────────────────────────────────
+        if content_mode == "company":
+            from anchor.extract.pipelines.company import extract_company
+            return await extract_company(
+                raw_post, session, content, platform, author, today,
+            )
+
+        return self._no_pipeline(content_mode)
+
+    async def extract_many(
+        self,
+        raw_posts: list[RawPost],
+        session: AsyncSession,
+        content_mode: str = "expert",
+        force: bool = False,
+        max_concurrency: int | None = None,
+    ) -> list[dict | None]:
+        """批量提取：LLM 计算阶段并发（Semaphore 限流），DB 写入阶段串行。
+
+        单篇提取 95% 以上的时间阻塞在 LLM 上，多篇并发可把总耗时压到接近单篇。
+        写入共用同一 session，按输入顺序逐篇执行，避免并发写冲突。
+
+        Returns:
+            与 raw_posts 等长的结果列表；计算阶段异常的帖子结果为 None。
+        """
+        if not raw_posts:
+            return []
+
+        limit = max_concurrency or settings.extract_max_concurrency
+        sem = asyncio.Semaphore(limit)
+        logger.info(
+            f"[Extractor] Batch extracting {len(raw_posts)} posts "
+            f"domain={content_mode} concurrency={limit}"
+        )
+
+        async def _compute(raw_post: RawPost):
+            async with sem:
+                prepared = await self._prepare(raw_post, content_mode, force)
+                if not isinstance(prepared, tuple):
+                    return prepared
+                if content_mode != "company":
+                    return self._no_pipeline(content_mode)
+                from anchor.extract.pipelines.company import extract_company_compute
+                return await extract_company_compute(*prepared)
+
+        computed = await asyncio.gather(
+            *(_compute(rp) for rp in raw_posts), return_exceptions=True,
+        )
+
+        from anchor.extract.pipelines.company import (
+            CompanyComputeResult,
+            extract_company_write,
+        )
+
+        results: list[dict | None] = []
+        for raw_post, item in zip(raw_posts, computed):
+            if isinstance(item, BaseException):
+                logger.error(f"[Extractor] RawPost {raw_post.id} compute failed: {item}")
+                results.append(None)
+            elif isinstance(item, CompanyComputeResult):
+                results.append(await extract_company_write(raw_post, session, item))
+            else:
+                results.append(item)
+        return results
+
+    async def _prepare(
+        self,
+        raw_post: RawPost,
+        content_mode: str,
+        force: bool,
+    ) -> tuple[str, str, str, str] | dict | None:
+        """提取前置检查 + 组装正文。
+
+        Returns:
+            (content, platform, author, today)，或应直接返回给调用方的跳过结果。
+        """
         if not force and raw_post.is_processed:
             logger.debug(f"RawPost {raw_post.id} already processed, skipping")
             return None
@@ -75,15 +160,10 @@ class Extractor:
         platform = raw_post.source
         author = raw_post.author_name
 
-        logger.info(f"[Extractor] Extracting RawPost id={raw_post.id} domain={content_mode}")
-
-        # ── 域路由 ─────────────────────────────────────────────────────
-        if content_mode == "company":
-            from anchor.extract.pipelines.company import extract_company
-            return await extract_company(
-                raw_post, session, content, platform, author, today,
-            )
+        return content, platform, author, today
 
+    @staticmethod
+    def _no_pipeline(content_mode: str) -> dict:
         # 其他域暂时禁用（不应走到这里，因为域开关已过滤）
         logger.warning(f"[Extractor] Domain '{content_mode}' has no pipeline, skipping")
         return {
@@ -0,0 +1,206 @@
+"""
+LLM 响应缓存
+============
+提取管线的 LLM 调用是 I/O 瓶颈，两级缓存尽量省掉完整的 LLM 往返：
+
+1. 精确匹配缓存：key = sha256(模型 + system + user + max_tokens + schema)，持久化到 llm_cache 表。
+   同一 RawPost 重跑（重试、--force、换管线后回放）直接命中，无需 embedding。
+2. 语义缓存：同一话题的帖子往往产生几乎相同的 prompt。对 user 消息求 embedding，
+   与同一 system prompt 下已缓存的请求比较余弦相似度，超过阈值直接复用上次的输出。
+
+语义缓存：
+- embedding 复用 llm_client.get_embeddings（OpenAI 兼容端点），未配置时自动跳过缓存
+- 按 system prompt 的哈希分区，不同提示词版本之间永不命中
+- 只缓存短 user 消息（≤ _EMBED_CHARS）；长文只走精确匹配缓存
+- 进程内 LRU，超出容量淘汰最久未命中的条目；相似度扫描在线程中进行
+
+配置方式（.env）：
+  LLM_EXACT_CACHE=true
+  LLM_SEMANTIC_CACHE=true
+  LLM_SEMANTIC_CACHE_THRESHOLD=0.97
+  LLM_SEMANTIC_CACHE_SIZE=2048
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import operator
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from loguru import logger
+
+from anchor.config import settings
+from anchor.llm_client import get_embeddings
+
+# 只对不超过 N 字符的 user 消息做语义缓存：截断前缀求 embedding 会让开头相同的长文
+# （同一公司的各期财报、同一模板的公告）互相误命中，长文只走精确匹配缓存
+_EMBED_CHARS = 4000
+
+
+def exact_key(
+    system: str,
+    user: str,
+    model: str | None = None,
+    max_tokens: int | None = None,
+    json_schema: dict | None = None,
+) -> str:
+    """精确匹配缓存 key：模型、提示词、max_tokens、输出 schema 任一变化都会换 key。
+
+    max_tokens 决定输出是否被截断，schema 决定输出结构，二者不同的响应不能互相复用。
+    """
+    schema = json.dumps(json_schema, sort_keys=True, ensure_ascii=False) if json_schema else ""
+    h = hashlib.sha256()
+    for part in (
+        settings.llm_provider, model or settings.llm_model, system, user,
+        str(max_tokens or ""), schema,
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+async def exact_get(key: str) -> str | None:
+    """按 key 读取缓存响应，未命中或读取失败返回 None。"""
+    from anchor.database.session import AsyncSessionLocal
+    from anchor.models import LLMCacheEntry
+
+    try:
+        async with AsyncSessionLocal() as s:
+            entry = await s.get(LLMCacheEntry, key)
+    except Exception as exc:
+        logger.warning(f"[ExactCache] read failed: {exc}")
+        return None
+    if entry is None:
+        return None
+    logger.debug(f"[ExactCache] hit key={key[:12]}")
+    return entry.response
+
+
+async def exact_put(key: str, response: str, model: str | None = None) -> None:
+    """写入（或覆盖）缓存响应。写入失败只记日志。"""
+    from anchor.database.session import AsyncSessionLocal
+    from anchor.models import LLMCacheEntry
+
+    try:
+        async with AsyncSessionLocal() as s:
+            await s.merge(LLMCacheEntry(
+                key=key, response=response, model=model or settings.llm_model or None,
+            ))
+            await s.commit()
+    except Exception as exc:
+        logger.warning(f"[ExactCache] write failed: {exc}")
+
+
+def _prompt_key(system: str, model: str | None = None) -> str:
+    h = hashlib.sha256(system.encode("utf-8"))
+    if model:
+        h.update(model.encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _unit(vec: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vec))
+    if norm == 0:
+        return vec
+    return [x / norm for x in vec]
+
+
+def _dot(a: list[float], b: list[float]) -> float:
+    return sum(map(operator.mul, a, b))
+
+
+class SemanticCache:
+    """进程内语义缓存（embedding 余弦相似度 + LRU）。
+
+    Args:
+        threshold:   命中阈值（余弦相似度），越高越保守
+        max_entries: 最大条目数，超出后按 LRU 淘汰
+    """
+
+    def __init__(self, threshold: float = 0.97, max_entries: int = 2048) -> None:
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # entry_id → (prompt_key, 单位向量, 响应文本)
+        self._entries: OrderedDict[int, tuple[str, list[float], str]] = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _best_match(
+        self, entries: list[tuple[int, tuple[str, list[float], str]]],
+        prompt_key: str, vec: list[float],
+    ) -> tuple[int | None, float]:
+        best_id, best_score = None, self.threshold
+        for entry_id, (key, cached_vec, _) in entries:
+            if key != prompt_key:
+                continue
+            score = _dot(vec, cached_vec)
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+        return best_id, best_score
+
+    async def _lookup(self, prompt_key: str, vec: list[float]) -> str | None:
+        # 全表点积是 O(条目数 × 维度) 的纯 CPU 计算，放到线程里跑，不阻塞事件循环
+        entries = list(self._entries.items())
+        best_id, best_score = await asyncio.to_thread(self._best_match, entries, prompt_key, vec)
+        if best_id is None or best_id not in self._entries:
+            return None
+        self._entries.move_to_end(best_id)
+        logger.debug(f"[SemanticCache] hit score={best_score:.4f}")
+        return self._entries[best_id][2]
+
+    def _store(self, prompt_key: str, vec: list[float], response: str) -> None:
+        self._entries[self._next_id] = (prompt_key, vec, response)
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_call(
+        self,
+        system: str,
+        user: str,
+        call: Callable[[], Awaitable[str | None]],
+        model: str | None = None,
+    ) -> str | None:
+        """命中则返回缓存响应；未命中调用 call() 并写入缓存。
+
+        model 非空时单独分区（级联提取中便宜模型与主模型的输出互不复用）。
+        user 超过 _EMBED_CHARS 或 embedding 失败时直接透传 call()。
+        注意命中即复用相似（而非相同）请求的输出，阈值过低会返回别的帖子的结果。
+        """
+        text = _normalize(user)
+        if len(text) > _EMBED_CHARS:
+            return await call()
+        vectors = await get_embeddings([text])
+        if not vectors:
+            return await call()
+
+        prompt_key = _prompt_key(system, model)
+        vec = _unit(vectors[0])
+        cached = await self._lookup(prompt_key, vec)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        response = await call()
+        if response is not None:
+            self._store(prompt_key, vec, response)
+        return response
+
+
+semantic_cache = SemanticCache(
+    threshold=settings.llm_semantic_cache_threshold,
+    max_entries=settings.llm_semantic_cache_size,
+)
@@ -25,12 +25,13 @@ Batch 模式（enable_batch=True + llm_provider=openai）：
 from __future__ import annotations
 
 import asyncio
-import json
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 from anchor.config import settings
 
 
@@ -47,15 +48,26 @@ async def chat_completion(
     user: str,
     max_tokens: int = 4096,
     model: str | None = None,
+    stream: bool = False,
+    json_schema: dict | None = None,
 ) -> Optional[LLMResponse]:
     """调用 LLM，返回文本响应。失败返回 None。
 
     Args:
-        model: 覆盖默认模型（用于多模型方案设计场景）。None 则使用 settings 配置的主模型。
+        model:       覆盖默认模型（用于多模型方案设计场景）。None 则使用 settings 配置的主模型。
+        stream:      以流式传输接收响应（结果仍一次性返回）。长输出（万级 token）时连接持续有数据，
+                     不会因代理/网关空闲超时被掐断，首包也更早到达。
+        json_schema: 约束模型只输出一个 JSON 对象（无代码围栏、无说明文字），content 即 JSON 文本。
+                     OpenAI 兼容端点走 response_format=json_object（schema 由提示词描述），
+                     Ollama 走 format=schema，Anthropic 走强制工具调用（input_schema=schema）。
     """
     if _is_openai_mode():
-        return await _openai_completion(system, user, max_tokens, model=model)
-    return await _anthropic_completion(system, user, max_tokens, model=model)
+        return await _openai_completion(
+            system, user, max_tokens, model=model, stream=stream, json_schema=json_schema,
+        )
+    return await _anthropic_completion(
+        system, user, max_tokens, model=model, stream=stream, json_schema=json_schema,
+    )
 
 
 async def batch_chat_completions(
@@ -138,6 +150,56 @@ async def chat_completion_multimodal(
     return await _anthropic_vision_completion(system, user, image_url, max_tokens)
 
 
+def extract_json_text(raw: str) -> str | None:
+    """从 LLM 输出中截取 JSON 对象文本，找不到返回 None。
+
+    用 str.find + 单遍扫描代替围栏正则（DOTALL 非贪婪匹配在长输出上回溯严重）：
+    1. 有 ``` 围栏且围栏内是对象 → 直接取围栏内容
+    2. 否则从第一个 { 起按括号深度扫描（跳过字符串字面量），取最外层完整对象
+    3. 对象未闭合（输出被截断）→ 退回 [第一个 {, 最后一个 }] 区间，交给 json 解析判定
+    """
+    fence = raw.find("```")
+    if fence != -1:
+        pos = fence + 3
+        if raw.startswith("json", pos):
+            pos += 4
+        close = raw.find("```", pos)
+        if close != -1:
+            body = raw[pos:close].strip()
+            if body.startswith("{") and body.endswith("}"):
+                return body
+
+    start = raw.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(start, len(raw)):
+        ch = raw[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return raw[start:i + 1]
+
+    end = raw.rfind("}")
+    if end < start:
+        return None
+    return raw[start:end + 1]
+
+
 # ---------------------------------------------------------------------------
 # 内部：判断使用哪个后端
 # ---------------------------------------------------------------------------
@@ -207,7 +269,7 @@ async def _openai_batch(
                     "max_tokens": max_tok,
                 },
             }
-            tmp.write(json.dumps(line, ensure_ascii=False) + "\n")
+            tmp.write(orjson.dumps(line).decode() + "\n")
         tmp.close()
 
         logger.info(f"[Batch] 提交 {len(requests)} 个请求 (model={use_model})")
@@ -265,7 +327,7 @@ async def _openai_batch(
         for line in output_text.strip().split("\n"):
             if not line.strip():
                 continue
-            item = json.loads(line)
+            item = orjson.loads(line)
             custom_id = item["custom_id"]
             resp_body = item.get("response", {}).get("body", {})
 
@@ -363,7 +425,8 @@ def _is_ollama() -> bool:
 
 
 async def _ollama_completion(
-    system: str, user: str, max_tokens: int, model: str | None = None
+    system: str, user: str, max_tokens: int, model: str | None = None,
+    json_schema: dict | None = None,
 ) -> Optional[LLMResponse]:
     """通过 Ollama 原生 /api/chat 调用，支持 think 参数。"""
     import httpx
@@ -381,6 +444,8 @@ async def _ollama_completion(
         "stream": False,
         "options": {"num_predict": max_tokens},
     }
+    if json_schema is not None:
+        payload["format"] = json_schema
     try:
         async with httpx.AsyncClient(timeout=300) as client:
             r = await client.post(api_url, json=payload)
@@ -400,11 +465,12 @@ async def _ollama_completion(
 
 
 async def _openai_completion(
-    system: str, user: str, max_tokens: int, model: str | None = None
+    system: str, user: str, max_tokens: int, model: str | None = None,
+    stream: bool = False, json_schema: dict | None = None,
 ) -> Optional[LLMResponse]:
     # Ollama 原生 API 支持 think 参数，走专用路径
     if _is_ollama():
-        return await _ollama_completion(system, user, max_tokens, model)
+        return await _ollama_completion(system, user, max_tokens, model, json_schema)
 
     from openai import AsyncOpenAI, APIError
 
@@ -412,6 +478,10 @@ async def _openai_completion(
         api_key=settings.llm_api_key or "ollama",  # Ollama 不需要真实 key
         base_url=settings.llm_base_url or None,
     )
+    # 兼容端点普遍只支持 json_object（不校验 schema），字段结构仍由提示词约束
+    extra = {"response_format": {"type": "json_object"}} if json_schema is not None else {}
+    if stream:
+        return await _openai_stream_completion(client, system, user, max_tokens, model, extra)
     try:
         resp = await client.chat.completions.create(
             model=model or _get_openai_model(),
@@ -420,6 +490,7 @@ async def _openai_completion(
                 {"role": "user", "content": user},
             ],
             max_tokens=max_tokens,
+            **extra,
         )
         return LLMResponse(
             content=resp.choices[0].message.content or "",
@@ -433,13 +504,74 @@ async def _openai_completion(
         return None
 
 
+# 部分 OpenAI 兼容端点（旧版 vLLM / Ollama 兼容层等）不认 stream_options，直接返回 400。
+# 去掉该参数重试成功后本进程内不再发送（流式用量统计记为 0）
+_stream_usage_supported = True
+
+
+async def _openai_stream_completion(
+    client, system: str, user: str, max_tokens: int, model: str | None = None,
+    extra: dict | None = None,
+) -> Optional[LLMResponse]:
+    global _stream_usage_supported
+    from openai import APIError, BadRequestError
+
+    parts: list[str] = []
+    resp_model = model or _get_openai_model()
+    input_tokens = output_tokens = 0
+
+    def _create(with_usage: bool):
+        return client.chat.completions.create(
+            model=resp_model,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user},
+            ],
+            max_tokens=max_tokens,
+            stream=True,
+            **({"stream_options": {"include_usage": True}} if with_usage else {}),
+            **(extra or {}),
+        )
+
+    try:
+        if _stream_usage_supported:
+            try:
+                stream = await _create(with_usage=True)
+            except BadRequestError:
+                stream = await _create(with_usage=False)
+                _stream_usage_supported = False
+        else:
+            stream = await _create(with_usage=False)
+        async for chunk in stream:
+            resp_model = chunk.model or resp_model
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+            if chunk.usage:
+                input_tokens = chunk.usage.prompt_tokens
+                output_tokens = chunk.usage.completion_tokens
+    except APIError as exc:
+        from loguru import logger
+        logger.error(f"[LLMClient] OpenAI API stream error: {exc}")
+        return None
+    return LLMResponse(
+        content="".join(parts),
+        model=resp_model,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Anthropic 后端
 # ---------------------------------------------------------------------------
 
 
+_JSON_TOOL = "emit_json"
+
+
 async def _anthropic_completion(
-    system: str, user: str, max_tokens: int, model: str | None = None
+    system: str, user: str, max_tokens: int, model: str | None = None,
+    stream: bool = False, json_schema: dict | None = None,
 ) -> Optional[LLMResponse]:
     import anthropic
 
@@ -450,15 +582,28 @@ async def _anthropic_completion(
         return None
 
     client = anthropic.AsyncAnthropic(api_key=api_key)
+    kwargs = dict(
+        model=model or _get_anthropic_model(),
+        max_tokens=max_tokens,
+        system=_anthropic_system(system),
+        messages=[{"role": "user", "content": user}],
+    )
+    if json_schema is not None:
+        # 强制调用唯一工具：模型输出即工具参数（结构化 JSON），不会夹带围栏或说明文字
+        kwargs["tools"] = [{
+            "name": _JSON_TOOL,
+            "description": "输出结构化结果",
+            "input_schema": json_schema,
+        }]
+        kwargs["tool_choice"] = {"type": "tool", "name": _JSON_TOOL}
     try:
-        resp = await client.messages.create(
-            model=model or _get_anthropic_model(),
-            max_tokens=max_tokens,
-            system=system,
-            messages=[{"role": "user", "content": user}],
-        )
+        if stream:
+            async with client.messages.stream(**kwargs) as s:
+                resp = await s.get_final_message()
+        else:
+            resp = await client.messages.create(**kwargs)
         return LLMResponse(
-            content=resp.content[0].text,
+            content=_anthropic_content(resp),
             model=resp.model,
             input_tokens=resp.usage.input_tokens,
             output_tokens=resp.usage.output_tokens,
@@ -469,6 +614,25 @@ async def _anthropic_completion(
         return None
 
 
+def _anthropic_system(system: str) -> str | list[dict]:
+    """system 提示词标记为可缓存前缀（Anthropic prompt caching）。
+
+    提取类提示词是每次调用都相同的长常量，缓存命中后这部分输入按缓存价计费、首包更快。
+    短于模型最小缓存长度时服务端直接忽略标记，不影响结果。
+    """
+    if not settings.llm_prompt_cache or not system:
+        return system
+    return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+
+
+def _anthropic_content(resp) -> str:
+    """取响应正文；工具调用响应返回工具参数的 JSON 文本。"""
+    for block in resp.content:
+        if block.type == "tool_use":
+            return orjson.dumps(block.input).decode()
+    return resp.content[0].text
+
+
 # ---------------------------------------------------------------------------
 # OpenAI 视觉（图片理解）
 # ---------------------------------------------------------------------------
@@ -15,7 +15,7 @@ Anchor 核心数据模型
   TechInsight / PatentRight / PatentCommercial
 
 基础设施表：
-  AuthorGroup / Topic / Author / MonitoredSource / RawPost
+  AuthorGroup / Topic / Author / MonitoredSource / RawPost / LLMCacheEntry / APICacheEntry
   PostQualityAssessment / AuthorStanceProfile / AuthorStats
 """
 
@@ -23,6 +23,7 @@ from datetime import date, datetime, timezone
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -74,6 +75,10 @@ class Author(SQLModel, table=True):
     """观点作者"""
 
     __tablename__ = "authors"
+    # 同一平台账号只对应一条作者记录；入库走 ON CONFLICT upsert
+    __table_args__ = (
+        Index("ix_authors_platform_platform_id", "platform", "platform_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True)
@@ -124,6 +129,10 @@ class RawPost(SQLModel, table=True):
     """原始帖子 — 采集的未处理内容"""
 
     __tablename__ = "raw_posts"
+    # 去重键：采集入库按 (source, external_id) 查重；唯一约束同时防止并发采集重复写入
+    __table_args__ = (
+        Index("ix_raw_posts_source_external_id", "source", "external_id", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
 
@@ -180,6 +189,27 @@ class RawPost(SQLModel, table=True):
     )
 
 
+class LLMCacheEntry(SQLModel, table=True):
+    """LLM 响应精确匹配缓存 — key = sha256(模型 + system + user)"""
+
+    __tablename__ = "llm_cache"
+
+    key: str = Field(primary_key=True)
+    response: str
+    model: Optional[str] = None
+    created_at: datetime = Field(default_factory=_utcnow)
+
+
+class APICacheEntry(SQLModel, table=True):
+    """平台 API 响应缓存（上下文补全用）— key = 来源:类型:版本:外部 ID"""
+
+    __tablename__ = "api_cache"
+
+    key: str = Field(primary_key=True)
+    payload: str                                   # JSON 文本
+    created_at: datetime = Field(default_factory=_utcnow)
+
+
 
 # ===========================================================================
 # 评估与统计表（保留，通用判断/事实验证使用）
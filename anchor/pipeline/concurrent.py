@@ -276,17 +276,18 @@ class ConcurrentBatchRunner:
                 select(RawPost).where(RawPost.id == raw_post_id)
             )).first()
             content = rp.enriched_content or rp.content
-
-            if rp.media_json:
-                from anchor.collect.media_describer import describe_media
-                media_desc = await describe_media(rp)
-                if media_desc:
-                    content = content + "\n\n--- 图片内容 ---\n" + media_desc
-
             today = (rp.posted_at or _dt.datetime.utcnow()).date().isoformat()
             platform = rp.source
             author = rp.author_name
 
+        # 视觉/ASR 调用耗时数秒，先释放 session 再调用，避免并发 worker 长时间占用连接
+        # （expire_on_commit=False，rp 的已加载字段在 session 关闭后仍可读）
+        if rp.media_json:
+            from anchor.collect.media_describer import describe_media
+            media_desc = await describe_media(rp)
+            if media_desc:
+                content = content + "\n\n--- 图片内容 ---\n" + media_desc
+
         if content_mode == "company":
             from anchor.extract.pipelines.company import extract_company_compute
             return await extract_company_compute(content, platform, author, today)
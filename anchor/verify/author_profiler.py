@@ -22,13 +22,12 @@ credibility_tier 分级标准：
 from __future__ import annotations
 
 import asyncio
-import json
-import re
 
+import orjson
 from loguru import logger
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from anchor.llm_client import chat_completion
+from anchor.llm_client import chat_completion, extract_json_text
 from anchor.models import Author, _utcnow
 from anchor.verify.web_searcher import format_search_results, web_search
 
@@ -266,16 +265,11 @@ def _mark_fetched(author: Author) -> None:
 
 
 def _parse_json(raw: str) -> dict | None:
-    match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", raw, re.DOTALL)
-    json_str = match.group(1) if match else raw.strip()
-    if not match:
-        start = json_str.find("{")
-        end = json_str.rfind("}") + 1
-        if start == -1 or end == 0:
-            return None
-        json_str = json_str[start:end]
+    json_str = extract_json_text(raw)
+    if json_str is None:
+        return None
     try:
-        return json.loads(json_str)
+        return orjson.loads(json_str)
     except Exception as exc:
         logger.warning(f"[AuthorProfiler] JSON parse error: {exc}\nRaw: {raw[:300]}")
         return None
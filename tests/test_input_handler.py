@@ -0,0 +1,64 @@
+"""parse_url 按域名分派：子域名回退到父域，相似但不同的域名不误判。"""
+from __future__ import annotations
+
+import pytest
+
+from anchor.collect.input_handler import parse_url
+from anchor.models import SourceType
+
+
+@pytest.mark.parametrize(
+    "url, platform, source_type, platform_id",
+    [
+        ("https://twitter.com/jack/status/20", "twitter", SourceType.POST, "20"),
+        ("https://mobile.twitter.com/jack/status/20", "twitter", SourceType.POST, "20"),
+        ("x.com/jack", "twitter", SourceType.PROFILE, "jack"),
+        ("https://m.weibo.cn/status/NabcD123", "weibo", SourceType.POST, "NabcD123"),
+        ("https://weibo.com/1234567890", "weibo", SourceType.PROFILE, "1234567890"),
+        ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "youtube", SourceType.POST, "dQw4w9WgXcQ"),
+        ("https://m.youtube.com/shorts/dQw4w9WgXcQ", "youtube", SourceType.POST, "dQw4w9WgXcQ"),
+        ("https://youtu.be/dQw4w9WgXcQ", "youtube", SourceType.POST, "dQw4w9WgXcQ"),
+        ("https://www.bilibili.com/video/BV1xx411c7mD", "bilibili", SourceType.POST, "BV1xx411c7mD"),
+        ("https://truthsocial.com/@realDonaldTrump/posts/1", "truthsocial", SourceType.POST, "1"),
+    ],
+)
+def test_known_platforms(url, platform, source_type, platform_id):
+    parsed = parse_url(url)
+    assert (parsed.platform, parsed.source_type, parsed.platform_id) == (
+        platform, source_type, platform_id,
+    )
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://notyoutube.com/watch?v=dQw4w9WgXcQ",       # 仅后缀相同，不是子域名
+        "https://youtube.com.example.org/watch?v=dQw4w9WgXcQ",
+        "https://example.com/jack/status/20",
+        "https://www.youtube.com/feed/trending",             # 平台域名但无法解析出 ID
+    ],
+)
+def test_unknown_or_unparsable_falls_back_to_web(url):
+    parsed = parse_url(url)
+    assert parsed.platform == "web"
+    assert parsed.canonical_url == url
+
+
+async def test_upsert_author_reports_new_only_once():
+    from anchor.collect.input_handler import upsert_author
+    from anchor.database.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        first, is_new = await upsert_author(
+            session, platform="twitter", platform_id="upsert-1", name="old"
+        )
+        assert is_new
+        again, is_new = await upsert_author(
+            session, platform="twitter", platform_id="upsert-1", name="new",
+            update_name=False,
+        )
+        assert (again.id, again.name, is_new) == (first.id, "old", False)
+        again, is_new = await upsert_author(
+            session, platform="twitter", platform_id="upsert-1", name="new"
+        )
+        assert (again.id, again.name, is_new) == (first.id, "new", False)
@@ -0,0 +1,42 @@
+"""extract_json_text：围栏 / 裸 JSON / 嵌套括号 / 截断输出。"""
+from __future__ import annotations
+
+import json
+
+from anchor.llm_client import extract_json_text
+
+
+def test_fenced_json():
+    raw = '说明文字\n```json\n{"a": 1, "b": [1, 2]}\n```\n结尾'
+    assert extract_json_text(raw) == '{"a": 1, "b": [1, 2]}'
+
+
+def test_fence_without_language_tag():
+    raw = '```\n{"a": 1}\n```'
+    assert extract_json_text(raw) == '{"a": 1}'
+
+
+def test_bare_json_with_surrounding_prose():
+    raw = '结果如下：{"ok": true} 以上。'
+    assert extract_json_text(raw) == '{"ok": true}'
+
+
+def test_nested_braces_and_braces_in_strings():
+    raw = '前缀 {"a": {"b": {"c": 1}}, "s": "x}y{z", "e": "\\"}"} 后缀 {"other": 2}'
+    text = extract_json_text(raw)
+    assert json.loads(text) == {"a": {"b": {"c": 1}}, "s": "x}y{z", "e": '"}'}
+
+
+def test_fence_with_non_object_falls_back_to_scan():
+    raw = '```python\nprint(1)\n```\n{"a": 1}'
+    assert extract_json_text(raw) == '{"a": 1}'
+
+
+def test_truncated_object_returns_widest_span():
+    raw = '{"a": {"b": 1}, "c": '
+    assert extract_json_text(raw) == '{"a": {"b": 1}'
+
+
+def test_no_json():
+    assert extract_json_text("没有 JSON") is None
+    assert extract_json_text("} 只有右括号") is None
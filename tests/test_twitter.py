@@ -0,0 +1,43 @@
+"""Syndication token 与旧实现（逐位生成 + 正则去 0 和小数点）一致。"""
+from __future__ import annotations
+
+import math
+import random
+import re
+
+from anchor.collect.twitter import _get_syndication_token
+
+
+def _reference_token(tweet_id: str) -> str:
+    val = (int(tweet_id) / 1e15) * math.pi
+    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+    integer = int(val)
+    frac = val - integer
+    parts: list[str] = []
+    while integer > 0:
+        parts.insert(0, chars[integer % 36])
+        integer //= 36
+    if not parts:
+        parts = ["0"]
+    if frac > 0:
+        parts.append(".")
+        for _ in range(10):
+            frac *= 36
+            d = int(frac)
+            parts.append(chars[d])
+            frac -= d
+    return re.sub(r"(0+|\.)", "", "".join(parts))
+
+
+def test_token_matches_reference():
+    rng = random.Random(0)
+    ids = ["1", "20", "1000000000000000", "1893847384738473847"]
+    ids += [str(rng.randrange(1, 2 ** 63)) for _ in range(2000)]
+    for tweet_id in ids:
+        assert _get_syndication_token(tweet_id) == _reference_token(tweet_id), tweet_id
+
+
+def test_token_has_no_zero_or_dot():
+    token = _get_syndication_token("1893847384738473847")
+    assert token
+    assert "0" not in token and "." not in token
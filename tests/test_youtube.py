@@ -0,0 +1,128 @@
+"""YouTube watch 页面解析与音频切段。"""
+from __future__ import annotations
+
+import os
+from datetime import datetime
+
+import httpx
+import orjson
+import pytest
+
+from anchor.collect.youtube import _fetch_watch_page, _parse_player_response, _split_audio
+
+_WATCH_URL = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+
+
+def _player_page(data: dict) -> str:
+    blob = orjson.dumps(data).decode()
+    return f"<html><script>var ytInitialPlayerResponse = {blob};var meta = 1;</script></html>"
+
+
+_PLAYER = {
+    "videoDetails": {
+        "title": "A & B \"quoted\"",
+        "author": "Some Channel",
+        "channelId": "UC123",
+        "lengthSeconds": "212",
+    },
+    "microformat": {
+        "playerMicroformatRenderer": {"publishDate": "2024-05-01T01:00:00-07:00"},
+    },
+}
+
+
+def test_player_response_with_video_details():
+    assert _parse_player_response(_player_page(_PLAYER)) == (
+        'A & B "quoted"', "Some Channel", "UC123", 212, datetime(2024, 5, 1),
+    )
+
+
+def test_player_response_without_video_details():
+    assert _parse_player_response(_player_page({"playabilityStatus": {"status": "ERROR"}})) is None
+
+
+def test_player_response_missing_or_malformed():
+    assert _parse_player_response("<html>consent</html>") is None
+    assert _parse_player_response(
+        "<script>ytInitialPlayerResponse = {not json};</script>"
+    ) is None
+
+
+def _client(body: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body))
+    )
+
+
+async def test_watch_page_uses_player_json():
+    async with _client(_player_page(_PLAYER)) as client:
+        parsed = await _fetch_watch_page(client, _WATCH_URL)
+    assert parsed[2:4] == ("UC123", 212)
+
+
+async def test_watch_page_regex_fallback():
+    body = '<script>{"title":"T &amp; U","channelId":"UC9","lengthSeconds":"5"}</script>'
+    async with _client(body) as client:
+        parsed = await _fetch_watch_page(client, _WATCH_URL)
+    assert parsed == ("T & U", None, "UC9", 5, None)
+
+
+async def test_watch_page_without_player_data_is_a_failure():
+    # 同意页 / 中间页：返回 None，调用方才会回落 pytubefix
+    async with _client("<html><body>Before you continue</body></html>") as client:
+        assert await _fetch_watch_page(client, _WATCH_URL) is None
+
+
+# ---------------------------------------------------------------------------
+# _split_audio
+# ---------------------------------------------------------------------------
+
+
+def _write_silence(path: str, seconds: int, rate: int = 16000) -> None:
+    av = pytest.importorskip("av")
+    np = pytest.importorskip("numpy")
+
+    samples = 1024
+    with av.open(path, mode="w", format="ipod") as out_c:
+        stream = out_c.add_stream("aac", rate=rate)
+        stream.layout = "mono"
+        for i in range(seconds * rate // samples):
+            frame = av.AudioFrame.from_ndarray(
+                np.zeros((1, samples), dtype=np.float32), format="fltp", layout="mono"
+            )
+            frame.rate = rate
+            frame.pts = i * samples
+            for pkt in stream.encode(frame):
+                out_c.mux(pkt)
+        for pkt in stream.encode():
+            out_c.mux(pkt)
+
+
+def _duration(path: str) -> float:
+    import av
+
+    with av.open(path) as c:
+        return c.duration / av.time_base
+
+
+def test_split_audio_into_ordered_chunks(tmp_path):
+    src = str(tmp_path / "audio.m4a")
+    _write_silence(src, 75)
+
+    chunks = _split_audio(src, str(tmp_path), 30)
+
+    assert [os.path.basename(p) for p in chunks] == [
+        "chunk_000.m4a", "chunk_001.m4a", "chunk_002.m4a",
+    ]
+    durations = [_duration(p) for p in chunks]
+    assert durations[0] == pytest.approx(30, abs=0.5)
+    assert durations[1] == pytest.approx(30, abs=0.5)
+    assert sum(durations) == pytest.approx(_duration(src), abs=0.5)
+
+
+def test_split_audio_short_input_is_returned_as_is(tmp_path):
+    src = str(tmp_path / "audio.m4a")
+    _write_silence(src, 10)
+
+    assert _split_audio(src, str(tmp_path), 30) == [src]
+    assert not any(p.name.startswith("chunk_") for p in tmp_path.iterdir())